@@ -15,24 +15,29 @@ Car rental app (MySQL/XAMPP database-based storage)
 
 import sys
 import os
-import urllib.request
+import re
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from math import ceil
 
-# IMPORTANT: You must install this library: pip install mysql-connector-python
-import mysql.connector
-
-# Import the specific error class for graceful handling
-from mysql.connector import Error as MySQL_Error
-
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout,
-    QGridLayout, QMessageBox, QStackedWidget, QComboBox, QTextEdit, QTableWidget,
-    QTableWidgetItem, QRadioButton, QButtonGroup, QHeaderView, QFrame,
-    QFormLayout
+    QGridLayout, QMessageBox, QStackedWidget, QComboBox, QTextEdit, QTableView,
+    QRadioButton, QButtonGroup, QHeaderView, QFrame,
+    QFormLayout, QDateTimeEdit, QScrollArea
+)
+from PyQt5.QtGui import QFont, QPixmap, QPixmapCache
+from PyQt5.QtCore import (
+    Qt, QAbstractTableModel, QDateTime, QModelIndex, QObject, QRunnable, QThreadPool, QTimer, QUrl,
+    pyqtSignal
 )
-from PyQt5.QtGui import QFont, QPixmap
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+
+log = logging.getLogger("drivesync")
 
 # ---------------- Database Configuration ----------------
 # !!! ADJUST THESE SETTINGS IF YOUR XAMPP/MySQL CONFIG IS DIFFERENT !!!
@@ -44,15 +49,72 @@ DB_CONFIG = {
 }
 
 
+_mysql_module = None
+
+
+def _mysql():
+    """
+    Imports mysql.connector on first use. It loads its C extension and auth plugins, which is
+    startup time the UI shouldn't pay before it needs the database.
+    """
+    global _mysql_module
+    if _mysql_module is None:
+        # IMPORTANT: You must install this library: pip install mysql-connector-python
+        import mysql.connector
+        import mysql.connector.errorcode
+        import mysql.connector.pooling
+        _mysql_module = mysql.connector
+    return _mysql_module
+
+
+def _pool_size():
+    """DRIVESYNC_POOL_SIZE if set, otherwise one connection per CPU, kept within 4-16."""
+    try:
+        return max(1, min(32, int(os.environ["DRIVESYNC_POOL_SIZE"])))  # the driver caps pools at 32
+    except (KeyError, ValueError):
+        return max(4, min(16, os.cpu_count() or 4))
+
+
+POOL = None
+_POOL_LOCK = threading.Lock()
+# hits: served by the pool; misses: pool exhausted, fell back to a one-off direct connection
+POOL_STATS = {"hits": 0, "misses": 0}
+
+
+def _get_pool():
+    """Creates the shared connection pool on first use (the pool opens its connections up front)."""
+    global POOL
+    with _POOL_LOCK:
+        if POOL is None:
+            # pool_reset_session=False: nothing here relies on per-session state, so skip the
+            # COM_RESET_CONNECTION round-trip every time a connection is handed back.
+            # autocommit=True: without the reset, a read-only checkout would otherwise return to the
+            # pool with its InnoDB snapshot still open and later reads would see stale rows; writes
+            # open an explicit transaction through cursor_ctx(commit=True).
+            POOL = _mysql().pooling.MySQLConnectionPool(pool_name="drivesync", pool_size=_pool_size(),
+                                                      pool_reset_session=False, autocommit=True,
+                                                      **DB_CONFIG)
+        return POOL
+
+
 def get_db_connection(show_error=True):
     """
-    Establishes and returns a MySQL database connection.
-    Returns None instead of raising a fatal exception on connection failure.
+    Returns a pooled MySQL database connection; calling close() on it hands it back to the pool.
+    If every pooled connection is checked out, a one-off direct connection is returned instead
+    (close() then really closes it). Returns None instead of raising on connection failure.
     """
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
+        try:
+            conn = _get_pool().get_connection()
+        except _mysql().PoolError:
+            with _POOL_LOCK:
+                POOL_STATS["misses"] += 1
+            print("Warning: connection pool exhausted; opening a direct connection.")
+            return _mysql().connect(autocommit=True, **DB_CONFIG)
+        with _POOL_LOCK:
+            POOL_STATS["hits"] += 1
         return conn
-    except MySQL_Error as err:
+    except _mysql().Error as err:
         if show_error:
             msg = f"Database Connection Error: {err}. Ensure XAMPP MySQL is running and DB_CONFIG is correct."
             try:
@@ -61,6 +123,15 @@ def get_db_connection(show_error=True):
                 print(f"FATAL ERROR: {msg}")
         return None
 
+
+def db_is_reachable():
+    """Checks the database is up, handing the probe connection straight back to the pool."""
+    conn = get_db_connection(show_error=False)
+    if not conn:
+        return False
+    conn.close()
+    return True
+
     # ---------------- General Helpers ----------------
 
 
@@ -79,7 +150,7 @@ QPushButton { background-color: #FFD700; color: #00274D; border-radius: 10px; pa
 QPushButton:hover { background-color: #FFEE80; }
 QPushButton:disabled { background-color: #AAAAAA; color: #555555; border: 1px solid #777777; }
 QLineEdit, QComboBox, QTextEdit { background: #ffffff; border: 2px solid #004080; border-radius: 8px; padding: 6px; }
-QTableWidget { background-color: #ffffff; alternate-background-color: #E6F0FF; }
+QTableView { background-color: #ffffff; alternate-background-color: #E6F0FF; }
 QFrame.dashboard_card { 
     background: #ffffff; border: 1px solid #CFE6FF; border-radius: 12px; padding: 10px; min-width: 250px; max-width: 350px; box-shadow: 0 4px 8px rgba(0,0,0,0.1); 
 }
@@ -96,96 +167,802 @@ QFrame.car_card[status="unavailable"] {
 """
 
 
+# Per-card stylesheets, layered on top of STYLE
+CAR_CARD_QSS_AVAIL = "QLabel { color: #002F6C; }"
+CAR_CARD_QSS_UNAVAIL = "QLabel { color: #888888; }"
+CAR_CARD_QSS_CURRENT = CAR_CARD_QSS_AVAIL + "QFrame.car_card { border: 3px solid #008000; }"
+
+
 def hours_between(start_dt: datetime, end_dt: datetime) -> int:
     secs = (end_dt - start_dt).total_seconds()
     return max(1, int(ceil(secs / 3600.0)))
 
 
-def load_image_data_from_url(url, timeout=6):
-    """Attempts to download image data from a URL."""
+# Downloaded car images are kept on disk, named by the SHA-1 of their URL. It lives in the user cache
+# directory rather than the temp dir so it survives reboots and temp cleaners. Files older than
+# IMAGE_CACHE_MAX_AGE are downloaded again (an image changed at the same URL shows up eventually), and
+# once per run the oldest files are pruned until the directory fits in IMAGE_CACHE_MAX_BYTES.
+IMAGE_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                               "carrental", "img")
+IMAGE_CACHE_MAX_AGE = 30 * 24 * 3600  # seconds
+IMAGE_CACHE_MAX_BYTES = 50 * 1024 * 1024
+_image_cache_pruned = False
+
+
+def _image_cache_path(url):
+    return os.path.join(IMAGE_CACHE_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+
+def load_cached_image_data(url):
+    """Returns the image bytes for a URL from the disk cache, or None if it was never downloaded or has expired."""
+    if not url:
+        return None
     try:
-        if not url:
-            return None
-        # This user agent can sometimes help with external sites like Wikimedia
-        req = urllib.request.Request(
-            url,
-            headers={'User-Agent': 'Mozilla/5.0'}
-        )
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            return resp.read()
-    except Exception:
+        with open(_image_cache_path(url), "rb") as f:
+            if time.time() - os.fstat(f.fileno()).st_mtime > IMAGE_CACHE_MAX_AGE:
+                return None  # re-downloaded, and overwritten, by the caller
+            return f.read()
+    except OSError:
         return None
 
 
-class ImageLoaderThread(QThread):
-    """Dedicated thread to prevent UI freezing while fetching images."""
-    image_loaded = pyqtSignal(int, bytes)
+def _prune_image_cache():
+    """Deletes expired files, then the oldest ones until the cache fits in IMAGE_CACHE_MAX_BYTES."""
+    try:
+        entries = []
+        with os.scandir(IMAGE_CACHE_DIR) as it:
+            for entry in it:
+                if entry.is_file():
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        return
+    entries.sort(reverse=True)  # newest first
+    now, total = time.time(), 0
+    for mtime, size, path in entries:
+        if now - mtime <= IMAGE_CACHE_MAX_AGE and total + size <= IMAGE_CACHE_MAX_BYTES:
+            total += size
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            pass
 
-    def __init__(self, car_id, url):
-        super().__init__()
-        self.car_id = car_id
-        self.url = url
 
-    def run(self):
-        data = load_image_data_from_url(self.url)
+def _store_cached_image_data(url, data):
+    global _image_cache_pruned
+    if not _image_cache_pruned:
+        _image_cache_pruned = True
+        _prune_image_cache()
+    try:
+        os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+        path = _image_cache_path(url)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)  # atomic, so a concurrent reader never sees a half-written file
+    except OSError:
+        pass  # caching is best-effort
+
+
+# Background DB jobs share Qt's global thread pool, capped so bursts of queries can't pile up threads
+WORKER_THREADS = 6
+
+IMAGE_TIMEOUT_MS = 6000
+_NAM = None
+
+
+def _network_manager():
+    """
+    One QNetworkAccessManager for all image downloads. Replies are delivered on the event loop, so no
+    worker threads are needed, and the manager keeps HTTP connections alive so the car images (mostly
+    on one host) share a socket instead of each paying its own TCP+TLS handshake.
+    """
+    global _NAM
+    if _NAM is None:
+        _NAM = QNetworkAccessManager()
+    return _NAM
+
+
+# Decoded, card-sized car pixmaps are kept in Qt's global LRU QPixmapCache (limit in KB)
+PIXMAP_CACHE_KB = 20 * 1024
+
+
+def _car_pixmap_key(car_id, url):
+    # The URL is part of the key so a car whose image is changed doesn't keep showing the old one
+    return f"car_{car_id}_{url}"
+
+
+# Size of the image slot on a car card
+CAR_IMAGE_WIDTH, CAR_IMAGE_HEIGHT = 250, 140
+
+# Wikimedia thumbnail URLs end in /<width>px-<file name>; the server renders any width up to the original's
+_WIKIMEDIA_THUMB_WIDTH = re.compile(r"/(\d+)px-([^/]+)$")
+
+
+def _sized_image_url(url, width=CAR_IMAGE_WIDTH):
+    """
+    Asks for Wikimedia thumbnails wider than a card at the card's width instead, so the server does the
+    downscaling and far fewer bytes are downloaded and decoded. Other URLs are returned unchanged (an
+    original file may be narrower than `width`, which the thumbnailer refuses to upscale).
+    """
+    qurl = QUrl(url)
+    if qurl.host() != "upload.wikimedia.org" or "/thumb/" not in qurl.path():
+        return url
+    m = _WIKIMEDIA_THUMB_WIDTH.search(url)
+    if not m or int(m.group(1)) <= width:
+        return url
+    return f"{url[:m.start()]}/{width}px-{m.group(2)}"
+
+
+# car_id -> callbacks waiting for that car's image, so a fetch already under way isn't started twice
+_IMAGE_INFLIGHT = {}
+_IMAGE_REPLIES = {}  # car_id -> its QNetworkReply, so a download nobody wants any more can be aborted
+
+
+def request_car_image(car_id, url, callback):
+    """Downloads a car image asynchronously and calls callback(car_id, data) on the GUI thread."""
+    waiting = _IMAGE_INFLIGHT.get(car_id)
+    if waiting is not None:
+        if callback not in waiting:  # e.g. the same grid being rebuilt before the first fetch ended
+            waiting.append(callback)
+        return
+    _IMAGE_INFLIGHT[car_id] = [callback]
+    if not url:
+        _on_car_image_loaded(car_id, b"")
+        return
+    req = QNetworkRequest(QUrl(_sized_image_url(url)))
+    # This user agent can sometimes help with external sites like Wikimedia
+    req.setRawHeader(b"User-Agent", b"Mozilla/5.0")
+    req.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
+    if hasattr(req, "setTransferTimeout"):  # Qt >= 5.15
+        req.setTransferTimeout(IMAGE_TIMEOUT_MS)
+    reply = _network_manager().get(req)
+    _IMAGE_REPLIES[car_id] = reply
+    reply.finished.connect(lambda: _on_image_reply(car_id, url, reply))
+
+
+def cancel_car_image_requests(callback):
+    """Stops delivering images to `callback`; downloads that no one else is waiting for are aborted."""
+    for car_id, waiting in list(_IMAGE_INFLIGHT.items()):
+        if callback in waiting:
+            waiting.remove(callback)
+        reply = _IMAGE_REPLIES.get(car_id)
+        if not waiting and reply is not None:
+            reply.abort()  # emits finished, which clears both entries
+
+
+def _on_image_reply(car_id, url, reply):
+    _IMAGE_REPLIES.pop(car_id, None)
+    data = b""
+    if reply.error() == QNetworkReply.NoError:
+        data = bytes(reply.readAll())
+        # A 200 can still be an HTML error page or a truncated body; only images that decode are kept
+        if not QPixmap().loadFromData(data):
+            data = b""
         if data:
-            self.image_loaded.emit(self.car_id, data)
+            _store_cached_image_data(url, data)
+    reply.deleteLater()
+    # Always notify (b"" on failure) so whoever is waiting on this car can stop waiting
+    _on_car_image_loaded(car_id, data)
+
+
+def _on_car_image_loaded(car_id, data):
+    for callback in _IMAGE_INFLIGHT.pop(car_id, []):
+        callback(car_id, data)
 
 
 # ---------------- Database Operations (Replaces JSON I/O) ----------------
 
+class DBUnavailableError(Exception):
+    """Raised by cursor_ctx when no connection could be obtained (the user has already been told)."""
+
+
+@contextmanager
+def cursor_ctx(dict_=True, commit=False, show_error=True, **cursor_opts):
+    """
+    Yields (conn, cursor) on one pooled connection so several statements can share a transaction.
+    With commit=True the statements run in one transaction that is committed on a clean exit; any
+    exception rolls back, and the connection always goes back to the pool. Pass show_error=False
+    off the GUI thread, where a QMessageBox can't be shown.
+    """
+    conn = get_db_connection(show_error=show_error)
+    if not conn:
+        raise DBUnavailableError("No database connection available.")
+    try:
+        if commit:
+            conn.start_transaction()
+        cursor = conn.cursor(dictionary=dict_, **cursor_opts)
+    except BaseException:
+        conn.close()
+        raise
+    try:
+        yield conn, cursor
+        if commit:
+            conn.commit()
+    except BaseException:
+        try:
+            conn.rollback()
+        except _mysql().Error:
+            pass  # connection already gone; the pool will reconnect it
+        raise
+    finally:
+        try:
+            cursor.close()
+        except _mysql().Error:
+            pass
+        # Always hand the connection back, even a dropped one: the pool reconnects it on next checkout.
+        conn.close()
+
+
 def db_fetch_one(sql, params=None):
-    conn = get_db_connection()
-    if not conn: return None
-    cursor = conn.cursor(dictionary=True)
     try:
-        cursor.execute(sql, params or ())
-        result = cursor.fetchone()
-        return result if result else {}
-    except MySQL_Error as err:
+        with cursor_ctx() as (conn, cursor):
+            cursor.execute(sql, params or ())
+            result = cursor.fetchone()
+            return result if result else {}
+    except DBUnavailableError:
+        return None
+    except _mysql().Error as err:
         QMessageBox.critical(None, "SQL Fetch Error", f"Failed to execute query: {err}")
         return None
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 
 def db_fetch_all(sql, params=None):
-    conn = get_db_connection()
-    if not conn: return []
-    cursor = conn.cursor(dictionary=True)
     try:
-        cursor.execute(sql, params or ())
-        results = cursor.fetchall()
-        return results
-    except MySQL_Error as err:
+        with cursor_ctx() as (conn, cursor):
+            cursor.execute(sql, params or ())
+            return cursor.fetchall()
+    except DBUnavailableError:
+        return []
+    except _mysql().Error as err:
         QMessageBox.critical(None, "SQL Fetch Error", f"Failed to execute query: {err}")
         return []
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
 
 
 def db_execute(sql, params=None, fetch_id=False):
-    conn = get_db_connection()
-    if not conn: return False
-    cursor = conn.cursor()
     try:
+        with cursor_ctx(dict_=False, commit=True) as (conn, cursor):
+            cursor.execute(sql, params or ())
+            return cursor.lastrowid if fetch_id else True
+    except DBUnavailableError:
+        return False
+    except _mysql().Error as err:
+        QMessageBox.critical(None, "SQL Execution Error", f"Failed to execute query: {err}")
+        return False
+
+
+EXECUTEMANY_CHUNK_ROWS = 1000
+
+
+def db_execute_many(sql, seq_of_params):
+    """
+    Runs one statement for many parameter tuples in a single transaction. For an INSERT ... VALUES
+    the driver folds each chunk into one multi-row INSERT, so M rows cost M/1000 round-trips, not M.
+    """
+    rows = list(seq_of_params)
+    if not rows: return True
+    try:
+        with cursor_ctx(dict_=False, commit=True) as (conn, cursor):
+            for i in range(0, len(rows), EXECUTEMANY_CHUNK_ROWS):
+                cursor.executemany(sql, rows[i:i + EXECUTEMANY_CHUNK_ROWS])
+            return True
+    except DBUnavailableError:
+        return False
+    except _mysql().Error as err:
+        QMessageBox.critical(None, "SQL Execution Error", f"Failed to execute batch: {err}")
+        return False
+
+
+# ---------------- Prepared Statements ----------------
+# Hot statements (login, booking save, change request insert, approve/reject) run as server-side
+# prepared statements on one long-lived connection, so MySQL parses each template once and later calls
+# only send the binary parameters. A prepared cursor only keeps its most recent statement, hence one
+# cursor per SQL template; the least recently prepared ones are closed beyond PREPARED_CACHE_MAX.
+
+_HOT_LOCK = threading.RLock()
+_hot_conn = None
+_PREPARED_CURSORS = {}
+PREPARED_CACHE_MAX = 64
+
+
+def _drop_hot_connection():
+    """Forgets the hot connection and its prepared cursors (their statements die with the session)."""
+    global _hot_conn
+    _PREPARED_CURSORS.clear()
+    if _hot_conn is not None:
+        try:
+            _hot_conn.close()
+        except _mysql().Error:
+            pass
+    _hot_conn = None
+
+
+def _prepared_cursor(sql):
+    """Returns the cached prepared cursor for `sql` on the hot connection (caller holds _HOT_LOCK)."""
+    cursor = _PREPARED_CURSORS.pop(sql, None)
+    if cursor is None:
+        if len(_PREPARED_CURSORS) >= PREPARED_CACHE_MAX:
+            oldest = next(iter(_PREPARED_CURSORS))
+            try:
+                _PREPARED_CURSORS.pop(oldest).close()  # deallocates the server-side statement
+            except _mysql().Error:
+                pass
+        cursor = _hot_conn.cursor(prepared=True)
+    _PREPARED_CURSORS[sql] = cursor  # re-inserted, so the dict stays in least-recently-used order
+    return cursor
+
+
+@contextmanager
+def hot_ctx(commit=False):
+    """
+    Yields (conn, prepare) for the hot connection, held exclusively for the duration of the block;
+    prepare(sql) returns the cached prepared cursor for that statement. With commit=True everything
+    in the block is one transaction, committed on a clean exit and rolled back on an exception.
+    """
+    global _hot_conn
+    with _HOT_LOCK:
+        try:
+            if _hot_conn is None:
+                _hot_conn = _mysql().connect(autocommit=True, **DB_CONFIG)
+        except _mysql().Error as err:
+            _drop_hot_connection()
+            raise DBUnavailableError(str(err)) from err
+        try:
+            if commit:
+                _hot_conn.start_transaction()
+            yield _hot_conn, _prepared_cursor
+            if commit:
+                _hot_conn.commit()
+        except (_mysql().InterfaceError, _mysql().OperationalError):
+            _drop_hot_connection()  # lost the session: reconnect and re-prepare next time
+            raise
+        except BaseException:
+            try:
+                _hot_conn.rollback()
+            except _mysql().Error:
+                _drop_hot_connection()
+            raise
+
+
+@contextmanager
+def prepared_ctx(sql, commit=False):
+    """Yields (conn, cursor) where cursor is the cached prepared cursor for `sql` on the hot connection."""
+    with hot_ctx(commit=commit) as (conn, prepare):
+        yield conn, prepare(sql)
+
+
+def query_one_prepared(sql, params=None):
+    """Runs a prepared point lookup and returns the row as a dict ({} if none). Raises on DB errors."""
+    try:
+        return _query_one_prepared(sql, params)
+    except (_mysql().InterfaceError, _mysql().OperationalError):
+        # The idle hot connection may have timed out; it has been dropped, and a read is safe to retry
+        return _query_one_prepared(sql, params)
+
+
+def _query_one_prepared(sql, params):
+    with prepared_ctx(sql) as (conn, cursor):
         cursor.execute(sql, params or ())
-        conn.commit()
-        if fetch_id:
-            return cursor.lastrowid
-        return True
-    except MySQL_Error as err:
-        conn.rollback()
+        rows = cursor.fetchall()
+        return dict(zip(cursor.column_names, rows[0])) if rows else {}
+
+
+def db_execute_prepared(sql, params=None, fetch_rowcount=False, fetch_id=False):
+    """
+    db_execute for hot write statements, executed as a server-side prepared statement.
+    With fetch_rowcount=True returns the affected row count (which may be 0) instead of True, with
+    fetch_id=True the row id (0 if none was inserted or set), and with both a (rowcount, id) pair.
+    """
+    try:
+        with prepared_ctx(sql, commit=True) as (conn, cursor):
+            cursor.execute(sql, params or ())
+            if fetch_rowcount and fetch_id:
+                return cursor.rowcount, cursor.lastrowid
+            if fetch_rowcount:
+                return cursor.rowcount
+            return cursor.lastrowid if fetch_id else True
+    except (DBUnavailableError, _mysql().Error) as err:
         QMessageBox.critical(None, "SQL Execution Error", f"Failed to execute query: {err}")
         return False
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+
+
+def db_call_prepared(sql, params=None, out_var=None):
+    """
+    Runs a CALL as a server-side prepared statement in one transaction, like db_execute_prepared.
+    With out_var (e.g. "@sp_done_ids") returns the value the procedure left in that session variable,
+    read before the hot connection is released, instead of True. Returns False on failure.
+    """
+    try:
+        with hot_ctx(commit=True) as (conn, prepare):
+            prepare(sql).execute(sql, params or ())
+            if out_var is None:
+                return True
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f"SELECT {out_var}")
+                value = cursor.fetchone()[0]
+            finally:
+                cursor.close()
+            return value.decode() if isinstance(value, (bytes, bytearray)) else value
+    except (DBUnavailableError, _mysql().Error) as err:
+        QMessageBox.critical(None, "SQL Execution Error", f"Failed to execute query: {err}")
+        return False
+
+
+# Query-result cache for small, read-mostly tables (e.g. cars): {(sql, params): (stored_at, rows)}
+_QCACHE = {}
+QCACHE_TTL = 30  # seconds
+
+
+def db_cache_get(sql, params=None, ttl=QCACHE_TTL):
+    """Returns the cached rows for (sql, params) if younger than `ttl` seconds, else None."""
+    hit = _QCACHE.get((sql, tuple(params or ())))
+    if hit and time.monotonic() - hit[0] < ttl:
+        return hit[1]
+    return None
+
+
+def db_cache_put(sql, params, rows):
+    if rows:  # an empty list may just mean the query failed, so don't pin it
+        _QCACHE[(sql, tuple(params or ()))] = (time.monotonic(), rows)
+
+
+def db_fetch_all_cached(sql, params=None, ttl=QCACHE_TTL):
+    """Like db_fetch_all, but serves repeat queries from _QCACHE for up to `ttl` seconds."""
+    rows = db_cache_get(sql, params, ttl)
+    if rows is None:
+        rows = db_fetch_all(sql, params)
+        db_cache_put(sql, params, rows)
+    return rows
+
+
+def db_cache_invalidate(*tables):
+    """Drops cached results that read any of the given tables (all of them when none are given)."""
+    if not tables:
+        _QCACHE.clear()
+        return
+    pattern = re.compile(r"\b(" + "|".join(map(re.escape, tables)) + r")\b")
+    for key in [k for k in _QCACHE if pattern.search(k[0])]:
+        del _QCACHE[key]
+
+
+CARS_CATALOG_SQL = "SELECT id, name, hourly_rate, car_condition, COALESCE(status, 'Unknown') AS status, img_url FROM cars"
+
+
+def load_cars_catalog():
+    """
+    The car grid's rows, served from _QCACHE (so reopening the grid within QCACHE_TTL costs no query;
+    admin status updates invalidate it). The query defaults a NULL status to 'Unknown', and each row gets
+    its 'available' flag once per refresh rather than on every grid build.
+    """
+    rows = db_cache_get(CARS_CATALOG_SQL)
+    if rows is None:
+        rows = db_fetch_all(CARS_CATALOG_SQL)
+        for car in rows:
+            car["available"] = car["status"] == "Available"
+        db_cache_put(CARS_CATALOG_SQL, None, rows)
+    return rows
+
+
+# ---------------- Background DB Jobs ----------------
+
+def query_all(sql, params=None):
+    """Fetches all rows without any UI side effects (raises on DB errors), for use in DbJob."""
+    with cursor_ctx(show_error=False) as (conn, cursor):
+        cursor.execute(sql, params or ())
+        return cursor.fetchall()
+
+
+def query_page(sql, count_sql, limit, offset, need_count=True):
+    """Fetches one LIMIT/OFFSET page of `sql` and, if asked, the total row count from `count_sql`."""
+    rows = query_all(sql, (limit, offset))
+    total = query_all(count_sql) if need_count else None
+    return rows, total
+
+
+PENDING_COUNT_SQL = "SELECT COUNT(*) AS n FROM car_change_requests WHERE status = 'Pending'"
+
+
+def query_badges(user_id, is_admin):
+    """Dashboard badge counts: all pending requests for an admin, the user's own rentals and requests otherwise."""
+    if is_admin:
+        return {"pending_requests": query_all(PENDING_COUNT_SQL)[0]["n"]}
+    return query_all(
+        "SELECT (SELECT COUNT(*) FROM rentals WHERE user_id = %s AND status = 'Active') AS rental_count, "
+        "(SELECT COUNT(*) FROM car_change_requests WHERE user_id = %s AND status = 'Pending') AS pending_count",
+        (user_id, user_id))[0]
+
+
+class DbJobSignals(QObject):
+    done = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class DbJob(QRunnable):
+    """Runs a blocking DB call on the shared thread pool so the event loop keeps running meanwhile."""
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = DbJobSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as err:  # an exception escaping run() would abort the whole app
+            self.signals.failed.emit(str(err))
+            return
+        self.signals.done.emit(result)
+
+
+def _show_db_job_error(message):
+    QMessageBox.critical(None, "Database Error", f"Database request failed!\n\nError: {message}")
+
+
+def submit_db_job(on_done, fn, *args, on_failed=None):
+    """Queues fn(*args) on the shared thread pool; on_done(result) / on_failed(msg) run on the GUI thread."""
+    job = DbJob(fn, *args)
+    job.signals.done.connect(on_done)
+    job.signals.failed.connect(on_failed or _show_db_job_error)
+    QThreadPool.globalInstance().start(job)
+    return job
+
+
+# ---------------- Schema Upkeep ----------------
+
+# Columns added to installed schemas at startup: (table, column, DDL)
+SCHEMA_COLUMNS = [
+    # new_car_id while the request is Pending, NULL afterwards. A unique key over it (below) allows
+    # only one pending request per (rental, new car) and ignores the handled ones, whose NULLs never clash.
+    ("car_change_requests", "pending_new_car_id",
+     "ALTER TABLE car_change_requests ADD COLUMN pending_new_car_id INT "
+     "AS (IF(status = 'Pending', new_car_id, NULL)) STORED"),
+]
+
+# Indexes the hot queries rely on; created at startup if the installed schema lacks them
+# (table, indexed columns, DDL). An index is only created when no existing index on the table already
+# starts with those columns, so schemas that declare it under another name don't get a duplicate.
+SCHEMA_INDEXES = [
+    # AdminRequestsPage: WHERE status = 'Pending' ORDER BY created_at, plus its COUNT(*)
+    ("car_change_requests", ("status", "created_at"),
+     "CREATE INDEX idx_ccr_status_created ON car_change_requests (status, created_at)"),
+    # Login lookup and the registration "username taken" check
+    ("users", ("username",), "CREATE UNIQUE INDEX ux_users_username ON users (username)"),
+    # Admin car panel, which filters by status
+    ("cars", ("status",), "CREATE INDEX ix_cars_status ON cars (status)"),
+    # CarSelectionPage.select_car: INSERT ... ON DUPLICATE KEY UPDATE for a repeated pending request
+    ("car_change_requests", ("rental_id", "pending_new_car_id"),
+     "CREATE UNIQUE INDEX uniq_pending ON car_change_requests (rental_id, pending_new_car_id)"),
+]
+
+# Stored procedures the admin request page calls: (name, DDL). Each takes the comma-separated request IDs,
+# so one CALL replaces the client-side statement pair. The IDs are validated and pasted into a dynamic
+# "id IN (...)", so the UPDATEs find their rows through the primary key. The procedures don't open a
+# transaction of their own: db_call_prepared already runs the CALL inside one, and rolls it back if a
+# statement fails. Only requests still Pending are handled; their IDs are left in @sp_done_ids, so the
+# caller can report what actually changed. The COMMENT is the procedure's version: bump it whenever a body changes, and installed
+# databases re-create that procedure on their next start.
+SCHEMA_PROCEDURES = [
+    ("sp_approve_car_change", """
+        CREATE PROCEDURE sp_approve_car_change(IN req_ids TEXT)
+        COMMENT 'v2'
+        BEGIN
+            IF req_ids NOT REGEXP '^[0-9]+(,[0-9]+)*$' THEN
+                SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'req_ids must be comma-separated request IDs';
+            END IF;
+            -- The pending subset of req_ids is never longer than req_ids itself
+            SET SESSION group_concat_max_len = GREATEST(@@group_concat_max_len, LENGTH(req_ids));
+            SET @sp_sql = CONCAT('SELECT GROUP_CONCAT(id ORDER BY id) INTO @sp_done_ids FROM car_change_requests ',
+                                 'WHERE id IN (', req_ids, ') AND status = ''Pending'' FOR UPDATE');
+            PREPARE sp_stmt FROM @sp_sql;
+            EXECUTE sp_stmt;
+            DEALLOCATE PREPARE sp_stmt;
+            IF @sp_done_ids IS NOT NULL THEN
+                SET @sp_sql = CONCAT('UPDATE rentals r JOIN car_change_requests ccr ON ccr.rental_id = r.id ',
+                                     'SET r.car_id = ccr.new_car_id WHERE ccr.id IN (', @sp_done_ids, ')');
+                PREPARE sp_stmt FROM @sp_sql;
+                EXECUTE sp_stmt;
+                DEALLOCATE PREPARE sp_stmt;
+                SET @sp_sql = CONCAT('UPDATE car_change_requests SET status = ''Approved'', updated_at = NOW() ',
+                                     'WHERE id IN (', @sp_done_ids, ')');
+                PREPARE sp_stmt FROM @sp_sql;
+                EXECUTE sp_stmt;
+                DEALLOCATE PREPARE sp_stmt;
+            END IF;
+            SET @sp_sql = NULL;
+        END"""),
+    ("sp_reject_car_change", """
+        CREATE PROCEDURE sp_reject_car_change(IN req_ids TEXT)
+        COMMENT 'v2'
+        BEGIN
+            IF req_ids NOT REGEXP '^[0-9]+(,[0-9]+)*$' THEN
+                SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'req_ids must be comma-separated request IDs';
+            END IF;
+            SET SESSION group_concat_max_len = GREATEST(@@group_concat_max_len, LENGTH(req_ids));
+            SET @sp_sql = CONCAT('SELECT GROUP_CONCAT(id ORDER BY id) INTO @sp_done_ids FROM car_change_requests ',
+                                 'WHERE id IN (', req_ids, ') AND status = ''Pending'' FOR UPDATE');
+            PREPARE sp_stmt FROM @sp_sql;
+            EXECUTE sp_stmt;
+            DEALLOCATE PREPARE sp_stmt;
+            IF @sp_done_ids IS NOT NULL THEN
+                SET @sp_sql = CONCAT('UPDATE car_change_requests SET status = ''Rejected'', updated_at = NOW() ',
+                                     'WHERE id IN (', @sp_done_ids, ')');
+                PREPARE sp_stmt FROM @sp_sql;
+                EXECUTE sp_stmt;
+                DEALLOCATE PREPARE sp_stmt;
+            END IF;
+            SET @sp_sql = NULL;
+        END"""),
+]
+
+
+_PROCEDURE_VERSION = re.compile(r"\bCOMMENT\s+'([^']*)'")
+
+
+def _installed_procedures(cursor):
+    """Returns {procedure name: its COMMENT} for the current database."""
+    cursor.execute("SELECT ROUTINE_NAME, ROUTINE_COMMENT FROM information_schema.ROUTINES "
+                   "WHERE ROUTINE_SCHEMA = DATABASE() AND ROUTINE_TYPE = 'PROCEDURE'")
+    return {name.lower(): comment for name, comment in cursor.fetchall()}
+
+
+def _existing_index_columns(cursor):
+    """Returns {table: [column tuple of each index]} for the current database."""
+    cursor.execute(
+        "SELECT TABLE_NAME, INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX"
+    )
+    indexes = {}
+    for table, index, column in cursor.fetchall():
+        indexes.setdefault((table.lower(), index), []).append(column.lower())
+    by_table = {}
+    for (table, _), columns in indexes.items():
+        by_table.setdefault(table, []).append(tuple(columns))
+    return by_table
+
+
+def _existing_columns(cursor):
+    """Returns the set of (table, column) pairs in the current database."""
+    cursor.execute("SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE()")
+    return {(table.lower(), column.lower()) for table, column in cursor.fetchall()}
+
+
+def ensure_schema():
+    """
+    Applies SCHEMA_COLUMNS and SCHEMA_INDEXES, skipping any that already exist, then creates the
+    SCHEMA_PROCEDURES that are missing or whose installed version (COMMENT) differs.
+    """
+    try:
+        with cursor_ctx(dict_=False, show_error=False) as (conn, cursor):
+            columns_present = _existing_columns(cursor)
+            for table, column, ddl in SCHEMA_COLUMNS:
+                if (table, column) in columns_present:
+                    continue
+                try:
+                    cursor.execute(ddl)
+                except _mysql().Error as err:
+                    if err.errno != _mysql().errorcode.ER_DUP_FIELDNAME:
+                        print(f"Schema upkeep skipped ({err}): {ddl}")
+
+            existing = _existing_index_columns(cursor)
+            for table, columns, ddl in SCHEMA_INDEXES:
+                if any(idx[:len(columns)] == columns for idx in existing.get(table, ())):
+                    continue
+                try:
+                    cursor.execute(ddl)
+                except _mysql().Error as err:
+                    if err.errno != _mysql().errorcode.ER_DUP_KEYNAME:
+                        print(f"Schema upkeep skipped ({err}): {ddl}")
+
+            installed = _installed_procedures(cursor)
+            for name, ddl in SCHEMA_PROCEDURES:
+                if installed.get(name) == _PROCEDURE_VERSION.search(ddl).group(1):
+                    continue
+                try:
+                    if name in installed:
+                        cursor.execute(f"DROP PROCEDURE IF EXISTS {name}")  # another client may be upgrading too
+                    cursor.execute(ddl)
+                except _mysql().Error as err:
+                    if err.errno != _mysql().errorcode.ER_SP_ALREADY_EXISTS:
+                        print(f"Schema upkeep skipped ({err}): {name}")
+    except (DBUnavailableError, _mysql().Error) as err:
+        print(f"Schema upkeep skipped: {err}")
+
+
+# ---------------- First-run Data ----------------
+
+SAMPLE_ADMIN = ("admin", "admin", "System Admin", "555-1234", "Headquarters, Main St", "admin")
+
+SAMPLE_CARS = [
+    ("Toyota Vios", 50.00, "Good", "Available",
+     "https://upload.wikimedia.org/wikipedia/commons/thumb/c/c2/Toyota_Vios_XP150_facelift_01.jpg/250px-Toyota_Vios_XP150_facelift_01.jpg"),
+    ("Honda City", 65.00, "Excellent", "Available",
+     "https://upload.wikimedia.org/wikipedia/commons/thumb/c/c8/Honda_City_Hatchback_e%3AHEV_RS_cropped.jpg/250px-Honda_City_Hatchback_e%3AHEV_RS_cropped.jpg"),
+    ("Mitsubishi Mirage", 45.00, "Fair", "In Use",
+     "https://upload.wikimedia.org/wikipedia/commons/thumb/2/23/Mitsubishi_Mirage_G4_%28facelift%29_--_01-27-2021.jpg/250px-Mitsubishi_Mirage_G4_%28facelift%29_--_01-27-2021.jpg"),
+    ("Ford Everest", 120.00, "Excellent", "Available",
+     "https://upload.wikimedia.org/wikipedia/commons/thumb/6/6f/2023_Ford_Everest_Sport_in_Australia_%28cropped%29.jpg/250px-2023_Ford_Everest_Sport_in_Australia_%28cropped%29.jpg"),
+    ("Nissan Navara", 100.00, "Good", "Available",
+     "https://upload.wikimedia.org/wikipedia/commons/thumb/e/e0/Nissan_Navara_V_2.5_Automatic_%28Thailand%29_front.jpg/250px-Nissan_Navara_V_2.5_Automatic_%28Thailand%29_front.jpg"),
+    ("Hyundai Accent", 55.00, "Good", "Maintenance",
+     "https://upload.wikimedia.org/wikipedia/commons/thumb/c/c2/2020_Hyundai_Accent_GLS_sedan.jpg/250px-2020_Hyundai_Accent_GLS_sedan.jpg"),
+    ("Suzuki Ertiga", 80.00, "Excellent", "Available",
+     "https://upload.wikimedia.org/wikipedia/commons/thumb/2/2f/Suzuki_Ertiga_II_facelift_in_Indonesia.jpg/250px-Suzuki_Ertiga_II_facelift_in_Indonesia.jpg"),
+    ("Kia Picanto", 40.00, "Fair", "Available",
+     "https://upload.wikimedia.org/wikipedia/commons/thumb/6/61/Kia_Picanto_GT-Line_MY18_%28cropped%29.jpg/250px-Kia_Picanto_GT-Line_MY18_%28cropped%29.jpg"),
+]
+
+
+def seed_sample_data():
+    """Inserts the default admin account and sample cars into empty tables (first run only)."""
+    counts = db_fetch_one("SELECT (SELECT COUNT(*) FROM users) AS users, (SELECT COUNT(*) FROM cars) AS cars")
+    if not counts:
+        return
+    if counts["users"] == 0:
+        db_execute("INSERT INTO users (username, password, name, phone, addr, role) VALUES (%s, %s, %s, %s, %s, %s)",
+                   SAMPLE_ADMIN)
+    if counts["cars"] == 0:
+        db_execute_many("INSERT INTO cars (name, hourly_rate, car_condition, status, img_url) VALUES (%s, %s, %s, %s, %s)",
+                        SAMPLE_CARS)
+
+
+# ---------------- Table Helpers ----------------
+
+# Display formats shared by the table columns
+HOUR_FMT = "%Y-%m-%d %H:00"
+MINUTE_FMT = "%Y-%m-%d %H:%M"
+
+
+class RowsTableModel(QAbstractTableModel):
+    """
+    Read-only model over a list of row dicts, for a QTableView. A row's cells are formatted the first
+    time the view paints it and kept, so loading rows is one model reset rather than a QTableWidgetItem
+    per cell, and repaints don't re-run strftime. `columns` is a list of (header, row -> text) pairs.
+    """
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self._columns = columns
+        self._formatters = tuple(fmt for _, fmt in columns)
+        self._rows = []
+        self._cells = []  # per row: tuple of display strings, or None until first painted
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        cells = self._cells[index.row()]
+        if cells is None:
+            row = self._rows[index.row()]
+            cells = self._cells[index.row()] = tuple([fmt(row) for fmt in self._formatters])
+        return cells[index.column()]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._columns[section][0]
+        return super().headerData(section, orientation, role)
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._cells = [None] * len(self._rows)
+        self.endResetModel()
+
+    def row(self, i):
+        return self._rows[i]
+
+    def update_row(self, i, **changes):
+        """Changes fields of one row and repaints just that row."""
+        self._rows[i].update(changes)
+        self._cells[i] = None
+        self.dataChanged.emit(self.index(i, 0), self.index(i, len(self._columns) - 1))
 
 
 # ---------------- Pages (Modified to use DB functions) ----------------
@@ -210,13 +987,13 @@ class LoginPage(QWidget):
         layout.addWidget(self.username)
         layout.addWidget(self.password)
         btn_h = QHBoxLayout()
-        login_btn = QPushButton("Login")
-        login_btn.setFont(FONT_LABEL)
-        login_btn.clicked.connect(self.handle_login)
+        self.login_btn = QPushButton("Login")
+        self.login_btn.setFont(FONT_LABEL)
+        self.login_btn.clicked.connect(self.handle_login)
         reg_btn = QPushButton("Register")
         reg_btn.setFont(FONT_LABEL)
         reg_btn.clicked.connect(lambda: self.stacked.setCurrentIndex(self.stacked.register_index))
-        btn_h.addWidget(login_btn)
+        btn_h.addWidget(self.login_btn)
         btn_h.addWidget(reg_btn)
         layout.addLayout(btn_h)
 
@@ -238,15 +1015,28 @@ class LoginPage(QWidget):
             QMessageBox.warning(self, "Missing", "Enter username and password.")
             return
 
+        # Kept to a plain point lookup; the dashboard badge counts are fetched separately afterwards
         sql = "SELECT id, username, name, phone, addr, role FROM users WHERE username = %s AND password = %s"
-        found = db_fetch_one(sql, (u, p))
+        # Runs on the worker pool; the button stays disabled until the result comes back
+        self.login_btn.setEnabled(False)
+        submit_db_job(self._on_login_result, query_one_prepared, sql, (u, p),
+                      on_failed=self._on_login_failed)
 
+    def _on_login_failed(self, message):
+        self.login_btn.setEnabled(True)
+        _show_db_job_error(message)
+
+    def _on_login_result(self, found):
+        self.login_btn.setEnabled(True)
         if not found:
             QMessageBox.warning(self, "No user", "User not found or wrong password.")
             return
 
+        u = found["username"]
         self.stacked.user_data = {"user_id": found['id'], "username": u, "user": found,
                                   "is_admin": found.get("role") == "admin"}
+        # Start counting in the background now so the badges are usually there when the dashboard opens
+        self.stacked.widget(self.stacked.dashboard_index).refresh_badges()
 
         if not found.get("name") or not found.get("phone") or not found.get("addr"):
             self.stacked.setCurrentIndex(self.stacked.complete_info_index)
@@ -387,6 +1177,7 @@ class DashboardPage(QWidget):
     def __init__(self, stacked):
         super().__init__()
         self.stacked = stacked
+        self._badges_in_flight = None  # user_id whose badge counts are being fetched
         self.layout_main = QVBoxLayout(self)
         self.layout_main.setAlignment(Qt.AlignTop | Qt.AlignHCenter)
         self.layout_main.setSpacing(20)
@@ -396,6 +1187,11 @@ class DashboardPage(QWidget):
         self.title.setAlignment(Qt.AlignCenter)
         self.layout_main.addWidget(self.title)
 
+        self.badge_label = QLabel("")
+        self.badge_label.setFont(FONT_LABEL)
+        self.badge_label.setAlignment(Qt.AlignCenter)
+        self.layout_main.addWidget(self.badge_label)
+
         self.content_container = QWidget()
         self.content_layout = QVBoxLayout(self.content_container)
         self.content_layout.setAlignment(Qt.AlignCenter)
@@ -456,6 +1252,46 @@ class DashboardPage(QWidget):
     def showEvent(self, event):
         is_admin = self.stacked.user_data.get("is_admin", False)
         self._toggle_admin_view(is_admin)
+        self._show_badges()
+        # The counts may have changed on another page, or the last fetch failed; a fetch the login
+        # queued that is still running is left to finish
+        self.refresh_badges()
+
+    def refresh_badges(self):
+        """Recounts the badge numbers on the worker pool and stores them in user_data['badges']."""
+        ud = self.stacked.user_data
+        user_id = ud.get("user_id")
+        if user_id is None or self._badges_in_flight == user_id:
+            return
+        self._badges_in_flight = user_id
+        submit_db_job(lambda badges: self._on_badges(user_id, badges), query_badges, user_id,
+                      ud.get("is_admin", False),
+                      on_failed=lambda message: self._on_badges_failed(user_id, message))
+
+    def _on_badges_failed(self, user_id, message):
+        if self._badges_in_flight == user_id:
+            self._badges_in_flight = None  # the next visit tries again
+        log.warning("Badge refresh failed: %s", message)
+
+    def _on_badges(self, user_id, badges):
+        if self._badges_in_flight == user_id:
+            self._badges_in_flight = None
+        if self.stacked.user_data.get("user_id") != user_id:
+            return  # logged out (or in as someone else) while the counts were running
+        self.stacked.user_data["badges"] = badges
+        self._show_badges()
+
+    def _show_badges(self):
+        badges = self.stacked.user_data.get("badges")
+        if not badges:
+            self.badge_label.setVisible(False)
+            return
+        if "pending_requests" in badges:
+            self.badge_label.setText(f"Pending car change requests: {badges['pending_requests']}")
+        else:
+            self.badge_label.setText(f"Active rentals: {badges['rental_count']} | "
+                                     f"Pending car changes: {badges['pending_count']}")
+        self.badge_label.setVisible(True)
 
     def _toggle_admin_view(self, is_admin):
         # Hide customer cards for admin view and vice-versa
@@ -549,11 +1385,17 @@ class AdminPage(QWidget):
         title.setAlignment(Qt.AlignCenter)
         v.addWidget(title)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["ID", "Name", "Hourly", "Condition", "Status"])
+        self.model = RowsTableModel([
+            ("ID", lambda car: str(car.get("id"))),
+            ("Name", lambda car: car.get("name")),
+            ("Hourly", lambda car: f"₱{car.get('hourly_rate', 0)}"),
+            ("Condition", lambda car: car.get("car_condition")),
+            ("Status", lambda car: car.get("status", "Unknown")),
+        ], self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.cellClicked.connect(self.on_row_selected)
+        self.table.clicked.connect(self.on_row_selected)
         v.addWidget(self.table)
 
         h_controls = QHBoxLayout()
@@ -581,38 +1423,83 @@ class AdminPage(QWidget):
 
         self.setLayout(v)
         self.selected_car_id = None
+        self.selected_row = None
+        self._load_seq = 0
+        self._conn = None  # pooled connection held while the page is on screen
+        self._update_cursor = None
 
     def showEvent(self, event):
+        # An admin session is many select-row/Update clicks; keep one connection for all of them
+        # instead of a pool round-trip per click. It goes back to the pool in hideEvent.
+        if self._conn is None:
+            self._conn = get_db_connection(show_error=False)
         self.load_car_data()
 
-    def load_car_data(self):
-        sql = "SELECT id, name, hourly_rate, car_condition, status FROM cars"
-        self.cars_data = db_fetch_all(sql)
+    def hideEvent(self, event):
+        self._release_connection()
 
-        if not self.cars_data and not get_db_connection(show_error=False):
-            self.table.setRowCount(0)
+    def _release_connection(self):
+        if self._conn is None:
             return
+        try:
+            if self._update_cursor is not None:
+                self._update_cursor.close()
+        except _mysql().Error:
+            pass
+        self._conn.close()  # hands it back to the pool (which reconnects it if it died)
+        self._conn = None
+        self._update_cursor = None
+
+    def _page_execute(self, sql, params=None):
+        """Runs the status UPDATE on the page's own connection as a prepared statement."""
+        try:
+            if self._conn is None:
+                self._conn = get_db_connection()
+                if self._conn is None:
+                    return False
+            if self._update_cursor is None:
+                self._update_cursor = self._conn.cursor(prepared=True)
+            self._update_cursor.execute(sql, params or ())  # autocommit pool: one statement, no txn
+            return True
+        except _mysql().Error as err:
+            self._release_connection()  # reconnect on the next click rather than reuse a bad session
+            QMessageBox.critical(self, "SQL Execution Error", f"Failed to execute query: {err}")
+            return False
 
-        self.table.setRowCount(len(self.cars_data))
-        for i, car in enumerate(self.cars_data):
-            self.table.setItem(i, 0, QTableWidgetItem(str(car.get("id"))))
-            self.table.setItem(i, 1, QTableWidgetItem(car.get("name")))
-            self.table.setItem(i, 2, QTableWidgetItem(f"₱{car.get('hourly_rate', 0)}"))
-            self.table.setItem(i, 3, QTableWidgetItem(car.get("car_condition")))
-
-            status_item = QTableWidgetItem(car.get("status", "Unknown"))
-            self.table.setItem(i, 4, status_item)
-
+    def load_car_data(self):
+        sql = "SELECT id, name, hourly_rate, car_condition, status FROM cars"
+        cached = db_cache_get(sql)
+        if cached is not None:
+            self._show_car_data(cached)
+            return
+        # Cache miss: fetch on the worker pool and fill the table when the rows arrive
+        self._load_seq += 1
+        seq = self._load_seq
+        submit_db_job(lambda rows: self._on_car_data(seq, sql, rows), query_all, sql,
+                      on_failed=self._on_load_failed)
+
+    def _on_car_data(self, seq, sql, rows):
+        if seq != self._load_seq:
+            return  # a newer load was started meanwhile
+        db_cache_put(sql, None, rows)
+        self._show_car_data(rows)
+
+    def _on_load_failed(self, message):
+        self.model.set_rows([])
+        _show_db_job_error(message)
+
+    def _show_car_data(self, rows):
+        self.model.set_rows(rows)
         self.selected_car_id = None
+        self.selected_row = None
         self.btn_update.setEnabled(False)
 
-    def on_row_selected(self, r, c):
-        item = self.table.item(r, 0)
-        if item:
-            self.selected_car_id = int(item.text())
-            current_status = self.table.item(r, 4).text()
-            self.status_combo.setCurrentText(current_status)
-            self.btn_update.setEnabled(True)
+    def on_row_selected(self, index):
+        car = self.model.row(index.row())
+        self.selected_row = index.row()
+        self.selected_car_id = car["id"]
+        self.status_combo.setCurrentText(car.get("status", ""))
+        self.btn_update.setEnabled(True)
 
     def update_car_status(self):
         if self.selected_car_id is None:
@@ -621,14 +1508,18 @@ class AdminPage(QWidget):
 
         new_status = self.status_combo.currentText()
         sql = "UPDATE cars SET status = %s WHERE id = %s"
-        success = db_execute(sql, (new_status, self.selected_car_id))
+        success = self._page_execute(sql, (new_status, self.selected_car_id))
 
         if success:
+            db_cache_invalidate("cars")
+            # Only this row changed, so repaint it in place instead of reloading the table
+            self.model.update_row(self.selected_row, status=new_status)
             QMessageBox.information(self, "Success",
                                     f"Status for Car ID {self.selected_car_id} updated to **{new_status}**.")
-            self.load_car_data()
+            self.table.clearSelection()
             self.btn_update.setEnabled(False)
             self.selected_car_id = None
+            self.selected_row = None
         else:
             QMessageBox.critical(self, "Error", "Failed to update car status.")
 
@@ -646,9 +1537,16 @@ class AdminRequestsPage(QWidget):
         title.setAlignment(Qt.AlignCenter)
         v.addWidget(title)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["Req ID", "User", "Rental ID", "Old Car", "New Car", "Submitted"])
+        self.model = RowsTableModel([
+            ("Req ID", lambda req: str(req.get("request_id"))),
+            ("User", lambda req: req.get("username")),
+            ("Rental ID", lambda req: str(req.get("rental_id"))),
+            ("Old Car", lambda req: req.get("old_car_name")),
+            ("New Car", lambda req: req.get("new_car_name")),
+            ("Submitted", lambda req: req.get("created_at").strftime(MINUTE_FMT)),
+        ], self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         # Ensure ID columns are readable but the last column stretches
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
@@ -658,18 +1556,21 @@ class AdminRequestsPage(QWidget):
         header.setSectionResizeMode(4, QHeaderView.Stretch)
         header.setSectionResizeMode(5, QHeaderView.Stretch)
 
-        self.table.cellClicked.connect(self.on_row_selected)
+        # Several requests can be selected and approved/rejected in one go
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.MultiSelection)
+        self.table.selectionModel().selectionChanged.connect(lambda *_: self.on_selection_changed())
         v.addWidget(self.table)
 
         h_controls = QHBoxLayout()
         h_controls.setAlignment(Qt.AlignCenter)
 
-        self.btn_approve = QPushButton("Approve Change")
+        self.btn_approve = QPushButton("Approve Selected")
         self.btn_approve.setFixedSize(200, 50)
         self.btn_approve.clicked.connect(self.approve_request)
         self.btn_approve.setEnabled(False)
 
-        self.btn_reject = QPushButton("Reject Request")
+        self.btn_reject = QPushButton("Reject Selected")
         self.btn_reject.setFixedSize(200, 50)
         self.btn_reject.clicked.connect(self.reject_request)
         self.btn_reject.setEnabled(False)
@@ -678,13 +1579,28 @@ class AdminRequestsPage(QWidget):
         h_controls.addWidget(self.btn_reject)
         v.addLayout(h_controls)
 
+        h_pages = QHBoxLayout()
+        h_pages.setAlignment(Qt.AlignCenter)
+        self.btn_prev = QPushButton("◀ Prev")
+        self.btn_prev.clicked.connect(lambda: self.change_page(-1))
+        self.page_label = QLabel("")
+        self.page_label.setFont(FONT_LABEL)
+        self.btn_next = QPushButton("Next ▶")
+        self.btn_next.clicked.connect(lambda: self.change_page(1))
+        for w in (self.btn_prev, self.page_label, self.btn_next): h_pages.addWidget(w)
+        v.addLayout(h_pages)
+
         back = QPushButton("Back to Dashboard")
         back.setFont(FONT_LABEL)
         back.clicked.connect(lambda: self.stacked.setCurrentIndex(self.stacked.dashboard_index))
         v.addWidget(back, alignment=Qt.AlignRight)
 
         self.setLayout(v)
-        self.selected_request_data = None
+        self.selected_requests = []
+        self._load_seq = 0
+        self.page = 0
+        self.page_size = 50
+        self.total_requests = 0
 
     def showEvent(self, event):
         self.load_requests()
@@ -705,70 +1621,126 @@ class AdminRequestsPage(QWidget):
                        JOIN cars c_old ON r.old_car_id = c_old.id
                        JOIN cars c_new ON r.new_car_id = c_new.id
               WHERE r.status = 'Pending'
-              ORDER BY r.created_at ASC
+              ORDER BY r.created_at ASC, r.id ASC
+              LIMIT %s OFFSET %s
               """
-        self.requests_data = db_fetch_all(sql)
-        self.table.setRowCount(len(self.requests_data))
-
-        for i, req in enumerate(self.requests_data):
-            self.table.setItem(i, 0, QTableWidgetItem(str(req.get("request_id"))))
-            self.table.setItem(i, 1, QTableWidgetItem(req.get("username")))
-            self.table.setItem(i, 2, QTableWidgetItem(str(req.get("rental_id"))))
-            self.table.setItem(i, 3, QTableWidgetItem(req.get("old_car_name")))
-            self.table.setItem(i, 4, QTableWidgetItem(req.get("new_car_name")))
-            self.table.setItem(i, 5, QTableWidgetItem(req.get("created_at").strftime("%Y-%m-%d %H:%M")))
-
-        self.selected_request_data = None
+        self.selected_requests = []
         self.btn_approve.setEnabled(False)
         self.btn_reject.setEnabled(False)
+        self.table.clearSelection()
+
+        # The pending total only changes on approve/reject, so it is cached and re-counted after those
+        cached_count = db_cache_get(PENDING_COUNT_SQL)
+        self._load_seq += 1
+        seq = self._load_seq
+        submit_db_job(lambda result: self._on_requests(seq, *result), query_page, sql, PENDING_COUNT_SQL,
+                      self.page_size, self.page * self.page_size, cached_count is None,
+                      on_failed=self._on_load_failed)
+        if cached_count is not None:
+            self.total_requests = cached_count[0]["n"]
+
+    def change_page(self, step):
+        self.page += step
+        self.load_requests()
 
-    def on_row_selected(self, r, c):
-        self.selected_request_data = self.requests_data[r]
-        self.btn_approve.setEnabled(True)
-        self.btn_reject.setEnabled(True)
+    def _update_page_controls(self):
+        pages = max(1, ceil(self.total_requests / self.page_size))
+        self.page_label.setText(f"Page {self.page + 1} of {pages} ({self.total_requests} pending)")
+        self.btn_prev.setEnabled(self.page > 0)
+        self.btn_next.setEnabled(self.page + 1 < pages)
+
+    def _on_load_failed(self, message):
+        self.model.set_rows([])
+        _show_db_job_error(message)
+
+    def _on_requests(self, seq, rows, count_rows):
+        if seq != self._load_seq:
+            return  # a newer load was started meanwhile
+        if count_rows is not None:
+            db_cache_put(PENDING_COUNT_SQL, None, count_rows)
+            self.total_requests = count_rows[0]["n"]
+        if not rows and self.page > 0:
+            # The page emptied (e.g. its last requests were just handled); step back one
+            self.page -= 1
+            self.load_requests()
+            return
+        self._update_page_controls()
+        self.model.set_rows(rows)
+
+    def on_selection_changed(self):
+        rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        self.selected_requests = [self.model.row(r) for r in rows]
+        has_selection = bool(self.selected_requests)
+        self.btn_approve.setEnabled(has_selection)
+        self.btn_reject.setEnabled(has_selection)
+
+    def _selected_ids_csv(self):
+        """Returns the selected request IDs as the comma-separated list the sp_*_car_change procedures take."""
+        return ",".join(str(req["request_id"]) for req in self.selected_requests)
+
+    def _split_handled(self, done_ids):
+        """Splits the selection by the comma-separated @sp_done_ids a procedure returned: (handled, skipped)."""
+        done = {int(i) for i in (done_ids or "").split(",") if i}
+        handled = [req for req in self.selected_requests if req["request_id"] in done]
+        skipped = [req for req in self.selected_requests if req["request_id"] not in done]
+        return handled, skipped
+
+    @staticmethod
+    def _skipped_note(skipped):
+        ids = ", ".join(str(req["request_id"]) for req in skipped)
+        return f"Request ID(s) {ids} were no longer pending and were left unchanged."
 
     def approve_request(self):
-        if not self.selected_request_data: return
-        req = self.selected_request_data
-
-        # 1. Update the main rental record
-        update_rental_sql = "UPDATE rentals SET car_id = %s WHERE id = %s"
-        rental_success = db_execute(update_rental_sql, (req['new_car_id'], req['rental_id']))
-
-        # 2. Update the request status
-        update_request_sql = "UPDATE car_change_requests SET status = 'Approved', updated_at = NOW() WHERE id = %s"
-        request_success = db_execute(update_request_sql, (req['request_id'],))
-
-        if rental_success and request_success:
-            QMessageBox.information(self, "Approved",
-                                    f"Rental ID {req['rental_id']} car changed to {req['new_car_name']}.")
+        if not self.selected_requests: return
+
+        # sp_approve_car_change moves every affected rental onto its requested car and marks the requests
+        # approved; the CALL runs in one transaction, so a rental is never swapped without its request. It
+        # skips requests another admin has handled meanwhile and reports the IDs it approved.
+        done_ids = db_call_prepared("CALL sp_approve_car_change(%s)", (self._selected_ids_csv(),),
+                                    out_var="@sp_done_ids")
+
+        if done_ids is not False:
+            db_cache_invalidate("rentals", "car_change_requests")
+            approved, skipped = self._split_handled(done_ids)
+            lines = [f"Rental ID {req['rental_id']} car changed to {req['new_car_name']}." for req in approved]
+            if skipped:
+                lines.append(self._skipped_note(skipped))
+            QMessageBox.information(self, "Approved" if approved else "Nothing Approved", "\n".join(lines))
         else:
             QMessageBox.critical(self, "Error", "Failed to finalize car change in database. Please check the logs.")
 
         # Modification: Reset state and refresh the table to ensure app continues gracefully
-        self.selected_request_data = None
+        self.selected_requests = []
         self.btn_approve.setEnabled(False)
         self.btn_reject.setEnabled(False)
         self.load_requests()
 
     def reject_request(self):
-        if not self.selected_request_data: return
-        req = self.selected_request_data
-
-        # 1. Update the request status (main rental record remains unchanged)
-        update_request_sql = "UPDATE car_change_requests SET status = 'Rejected', updated_at = NOW() WHERE id = %s"
-        success = db_execute(update_request_sql, (req['request_id'],))
-
-        if success:
-            QMessageBox.information(self, "Rejected", f"Car change request ID {req['request_id']} rejected.")
+        if not self.selected_requests: return
+
+        # Update the request status only (main rental records remain unchanged)
+        done_ids = db_call_prepared("CALL sp_reject_car_change(%s)", (self._selected_ids_csv(),),
+                                    out_var="@sp_done_ids")
+
+        if done_ids is not False:
+            db_cache_invalidate("car_change_requests")
+            rejected, skipped = self._split_handled(done_ids)
+            lines = []
+            if rejected:
+                lines.append(f"Car change request ID(s) {', '.join(str(req['request_id']) for req in rejected)} rejected.")
+            if skipped:
+                lines.append(self._skipped_note(skipped))
+            QMessageBox.information(self, "Rejected" if rejected else "Nothing Rejected", "\n".join(lines))
         else:
             QMessageBox.critical(self, "Error", "Failed to update request status in database.")
 
         # Modification: Reset state and refresh the table to ensure app continues gracefully
-        self.selected_request_data = None
+        self.selected_requests = []
         self.btn_approve.setEnabled(False)
         self.btn_reject.setEnabled(False)
         self.load_requests()
+
+
 class MyRentalsPage(QWidget):
     # ... (MyRentalsPage remains the same)
     def __init__(self, stacked):
@@ -780,11 +1752,19 @@ class MyRentalsPage(QWidget):
         title.setFont(FONT_BIG)
         title.setAlignment(Qt.AlignCenter)
         v.addWidget(title)
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(["ID", "Car", "Pickup", "End", "Hours", "Location", "Total"])
+        self.model = RowsTableModel([
+            ("ID", lambda r: str(r["id"])),
+            ("Car", lambda r: r["name"]),
+            ("Pickup", lambda r: r["start_time"].strftime(HOUR_FMT)),
+            ("End", lambda r: r["end_time"].strftime(HOUR_FMT)),
+            ("Hours", lambda r: str(r["hours_rented"])),
+            ("Location", lambda r: r["delivery_location"] or "N/A"),
+            ("Total", lambda r: f"₱{r['total_cost']}"),
+        ], self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.cellClicked.connect(self.on_row_selected)
+        self.table.clicked.connect(self.on_row_selected)
         v.addWidget(self.table)
         btn_h = QHBoxLayout()
         btn_h.setAlignment(Qt.AlignCenter)
@@ -794,7 +1774,7 @@ class MyRentalsPage(QWidget):
         self.btn_edit_car.setVisible(False)
         self.btn_edit_details = QPushButton("Edit Details")
         self.btn_edit_details.setFixedSize(160, 50)
-        self.btn_edit_details.clicked.connect(self.edit_dates)
+        self.btn_edit_details.clicked.connect(lambda: self.edit_dates())
         self.btn_edit_details.setVisible(False)
         self.btn_edit_delivery = QPushButton("Edit Delivery")
         self.btn_edit_delivery.setFixedSize(160, 50)
@@ -808,6 +1788,7 @@ class MyRentalsPage(QWidget):
         v.addWidget(back, alignment=Qt.AlignRight)
         self.setLayout(v)
         self.selected_row_data = None
+        self.user_rentals = []
 
     def showEvent(self, event):
         self.load_my_rentals()
@@ -815,29 +1796,27 @@ class MyRentalsPage(QWidget):
     def load_my_rentals(self):
         user_id = self.stacked.user_data.get("user_id")
         sql = """
-              SELECT r.id, c.name, r.start_time, r.end_time, r.hours_rented, r.delivery_location, r.total_cost
+              SELECT r.id, r.car_id, c.name, r.start_time, r.end_time, r.hours_rented, r.rental_mode,
+                     r.delivery_location, r.total_cost
               FROM rentals r
                        JOIN cars c ON r.car_id = c.id
               WHERE r.user_id = %s
               ORDER BY r.start_time DESC
               """
-        self.user_rentals = db_fetch_all(sql, (user_id,))
-        self.table.setRowCount(len(self.user_rentals))
-
-        for i, r in enumerate(self.user_rentals):
-            self.table.setItem(i, 0, QTableWidgetItem(str(r["id"])))
-            self.table.setItem(i, 1, QTableWidgetItem(r["name"]))
-            self.table.setItem(i, 2, QTableWidgetItem(r["start_time"].strftime("%Y-%m-%d %H:00")))
-            self.table.setItem(i, 3, QTableWidgetItem(r["end_time"].strftime("%Y-%m-%d %H:00")))
-            self.table.setItem(i, 4, QTableWidgetItem(str(r["hours_rented"])))
-            self.table.setItem(i, 5, QTableWidgetItem(r["delivery_location"] or "N/A"))
-            self.table.setItem(i, 6, QTableWidgetItem(f"₱{r['total_cost']}"))
+        # Served from the query cache when this user's rentals haven't changed since the last visit;
+        # every write to rentals invalidates it
+        rows = db_fetch_all_cached(sql, (user_id,))
+        if rows is not self.user_rentals:
+            self.user_rentals = rows
+            self.model.set_rows(rows)
+        else:
+            self.table.clearSelection()
 
         self.selected_row_data = None
         for b in (self.btn_edit_car, self.btn_edit_details, self.btn_edit_delivery): b.setVisible(False)
 
-    def on_row_selected(self, r, c):
-        self.selected_row_data = self.user_rentals[r]
+    def on_row_selected(self, index):
+        self.selected_row_data = self.user_rentals[index.row()]
         for b in (self.btn_edit_car, self.btn_edit_details, self.btn_edit_delivery): b.setVisible(True)
 
     def get_rental_id(self):
@@ -847,17 +1826,20 @@ class MyRentalsPage(QWidget):
         rental_id = self.get_rental_id()
         if rental_id is None: QMessageBox.warning(self, "Select", "Please select a booking first."); return
 
-        # Store data for the CarSelectionPage
-        self.stacked.user_data["editing"] = {"type": "car", "rental_id": rental_id}
+        # Store data for the CarSelectionPage; the rental's current car rides along so it isn't re-queried
+        self.stacked.user_data["editing"] = {"type": "car", "rental_id": rental_id,
+                                             "old_car_id": self.selected_row_data["car_id"]}
         self.stacked.setCurrentIndex(self.stacked.car_index)
 
-    def edit_dates(self):
+    def edit_dates(self, edit_type="dates"):
         rental_id = self.get_rental_id()
         if rental_id is None: QMessageBox.warning(self, "Select", "Please select a booking first."); return
 
-        r = self.selected_row_data
-        sql_fetch = "SELECT start_time, end_time, rental_mode, delivery_location FROM rentals WHERE id = %s"
-        details = db_fetch_one(sql_fetch, (rental_id,))
+        # The selected row already holds everything the time page needs
+        details = self.selected_row_data
+        if "rental_mode" not in details:
+            sql_fetch = "SELECT start_time, end_time, rental_mode, delivery_location FROM rentals WHERE id = %s"
+            details = db_fetch_one(sql_fetch, (rental_id,))
 
         if not details:
             QMessageBox.critical(self, "Error", "Could not fetch details for editing.")
@@ -869,11 +1851,18 @@ class MyRentalsPage(QWidget):
             "mode": details["rental_mode"],
             "delivery_location": details["delivery_location"] or ""
         }
-        self.stacked.user_data["editing"] = {"type": "dates", "rental_id": rental_id}
+        # Editing keeps the booking's own car; drop any car left over from an abandoned new booking
+        self.stacked.user_data.pop("car_temp", None)
+        self.stacked.user_data["editing"] = {"type": edit_type, "rental_id": rental_id}
         self.stacked.setCurrentIndex(self.stacked.time_index)
 
     def edit_delivery(self):
-        self.edit_dates()
+        # Same page as edit_dates, opened with Delivery preselected
+        self.edit_dates(edit_type="delivery")
+
+
+CAR_GRID_COLUMNS = 4
+CAR_ROW_HEIGHT_GUESS = 320  # px per grid row until the first card has been measured
 
 
 class CarSelectionPage(QWidget):
@@ -890,15 +1879,21 @@ class CarSelectionPage(QWidget):
         self.grid_scroll = QWidget()
         self.grid = QGridLayout(self.grid_scroll)
         self.grid.setSpacing(16)
+        self.grid.setAlignment(Qt.AlignTop)
 
-        scroll_area = QWidget()
-        scroll_layout = QVBoxLayout(scroll_area)
-        scroll_layout.addWidget(self.grid_scroll)
-        v.addWidget(scroll_area)
+        # Cards are only built (and their images fetched) once their row scrolls near the viewport
+        self.scroll = QScrollArea()
+        self.scroll.setWidgetResizable(True)
+        self.scroll.setFrameShape(QFrame.NoFrame)
+        self.scroll.setWidget(self.grid_scroll)
+        self.scroll.verticalScrollBar().valueChanged.connect(lambda _: self._ensure_visible_cards())
+        v.addWidget(self.scroll, 1)
 
         self.car_boxes = {}
-        self.threads = []
-        v.addStretch(1)
+        self.cars = []
+        self._current_car_id = None
+        self._row_height = CAR_ROW_HEIGHT_GUESS
+        self._row_measured = False
         back = QPushButton("Back to Dashboard")
         back.setFont(FONT_LABEL)
         back.clicked.connect(lambda: self.stacked.setCurrentIndex(self.stacked.dashboard_index))
@@ -907,128 +1902,173 @@ class CarSelectionPage(QWidget):
 
     def showEvent(self, event):
         self.load_cars_and_images()
+        QTimer.singleShot(0, self._ensure_visible_cards)  # again once the page has its final size
 
-    def clear_layout(self, layout):
-        if layout is not None:
-            while layout.count():
-                item = layout.takeAt(0)
-                widget = item.widget()
-                if widget is not None:
-                    widget.deleteLater()
-                else:
-                    self.clear_layout(item.layout())
+    def hideEvent(self, event):
+        # Leaving the grid: drop the downloads that were only for these cards
+        cancel_car_image_requests(self.update_car_image)
+        for card in self.car_boxes.values():
+            shown = card["label"].pixmap()
+            if shown is None or shown.isNull():
+                card.pop("img_url", None)  # download was cut short; ask again next time it's visible
 
-    def load_cars_and_images(self):
-        self.clear_layout(self.grid)
-        for thread in self.threads:
-            if thread.isRunning():
-                thread.quit()
-        self.threads = []
-        self.car_boxes = {}
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._ensure_visible_cards()
 
-        sql = "SELECT id, name, hourly_rate, car_condition, status, img_url FROM cars"
-        self.cars = db_fetch_all(sql)
-
-        if not self.cars and not get_db_connection(show_error=False):
+    def load_cars_and_images(self):
+        """
+        Syncs the grid with the catalog: cards that already exist are updated in place and cards for
+        cars that are gone are deleted. Cards for the remaining cars are built by _ensure_visible_cards
+        as their rows come into view; every row reserves its height so the scrollbar is right anyway.
+        """
+        self.cars = load_cars_catalog()
+
+        if not self.cars and not db_is_reachable():
             return
 
-        COLUMNS = 4
-
-        is_editing_car = self.stacked.user_data.get("editing", {}).get("type") == "car"
-        editing_rental_id = self.stacked.user_data.get("editing", {}).get("rental_id")
-        current_car_id = None
-
-        if is_editing_car and editing_rental_id:
-            sql_car = "SELECT car_id FROM rentals WHERE id = %s"
-            result = db_fetch_one(sql_car, (editing_rental_id,))
-            current_car_id = result.get('car_id') if result else None
+        edit = self.stacked.user_data.get("editing") or {}
+        self._current_car_id = edit.get("old_car_id") if edit.get("type") == "car" else None
 
+        seen = set()
         for i, c in enumerate(self.cars):
-            car_id = c["id"]
-            status = c.get("status", "Unknown")
-            is_available_in_db = status == "Available"
-
-            car_is_current_selection = (is_editing_car and car_id == current_car_id)
-
-            should_be_disabled = not car_is_current_selection and not is_available_in_db
-
-            box = QFrame()
-            box.setProperty("class", "car_card")
-
-            if should_be_disabled:
-                box.setProperty("status", "unavailable")
-                box.setStyleSheet(box.styleSheet() + "QLabel { color: #888888; }")
-            else:
-                box.setProperty("status", "available")
-                box.setStyleSheet(box.styleSheet() + "QLabel { color: #002F6C; }")
-
-            bl = QVBoxLayout()
-            img_lbl = QLabel("Loading Image...")
-            img_lbl.setFixedSize(250, 140)
-            img_lbl.setAlignment(Qt.AlignCenter)
-            img_lbl.setObjectName(f"img_lbl_{car_id}")
-
-            name_text = c["name"]
-            if car_is_current_selection:
-                name_text = f"{name_text} (Current Selection)"
-                box.setStyleSheet(box.styleSheet() + "QFrame.car_card { border: 3px solid #008000; }")
-
-            name = QLabel(name_text)
-            name.setFont(FONT_CAR_NAME)
-            cost = QLabel(f"₱{c['hourly_rate']}/hr")
-            cost.setFont(FONT_CAR_DETAIL)
-            status_text = f"Status: {status}"
-            status_color = "red" if not is_available_in_db else "#008000"
-            cond_text = f"Condition: {c.get('car_condition', '')}"
-            status_lbl = QLabel(
-                f"{cond_text} | <span style='color:{status_color}; font-weight:bold;'>{status_text}</span>")
-            status_lbl.setFont(FONT_CAR_DETAIL)
-            status_lbl.setTextFormat(Qt.RichText)
-
-            btn = QPushButton("Select Car")
-            btn.setFont(FONT_CARD_LABEL)
-
-            if should_be_disabled:
-                btn.setEnabled(False)
-                btn.setText(f"Status: {status}")
-            else:
-                btn.setEnabled(True)
-                btn.setText("Select Car")
-
-            btn.clicked.connect(lambda _, car=c: self.select_car(car))
-
-            bl.addWidget(img_lbl, alignment=Qt.AlignCenter)
-            bl.addWidget(name, alignment=Qt.AlignCenter)
-            bl.addWidget(cost, alignment=Qt.AlignCenter)
-            bl.addWidget(status_lbl, alignment=Qt.AlignCenter)
-            bl.addWidget(btn, alignment=Qt.AlignCenter)
-
-            box.setLayout(bl)
-
-            row = i // COLUMNS
-            col = i % COLUMNS
-            self.grid.addWidget(box, row, col)
+            seen.add(c["id"])
+            card = self.car_boxes.get(c["id"])
+            if card is not None:
+                self._place_card(i, c, card)
+
+        for car_id in set(self.car_boxes) - seen:
+            box = self.car_boxes.pop(car_id)["box"]
+            self.grid.removeWidget(box)
+            box.deleteLater()
+
+        self._reserve_rows()
+        self._ensure_visible_cards()
+
+    def _reserve_rows(self):
+        rows = ceil(len(self.cars) / CAR_GRID_COLUMNS)
+        for r in range(max(rows, self.grid.rowCount())):
+            self.grid.setRowMinimumHeight(r, self._row_height if r < rows else 0)
+
+    def _ensure_visible_cards(self):
+        """Builds the cards, and starts the image loads, for the rows in or near the viewport."""
+        if not self.cars or not self.isVisible():
+            return
+        top = self.scroll.verticalScrollBar().value()
+        first = max(0, top // self._row_height - 2)
+        last = (top + self.scroll.viewport().height()) // self._row_height + 2
+        for i in range(first * CAR_GRID_COLUMNS, min(len(self.cars), (last + 1) * CAR_GRID_COLUMNS)):
+            c = self.cars[i]
+            card = self.car_boxes.get(c["id"])
+            if card is None:
+                card = self.car_boxes[c["id"]] = self._create_card(c["id"])
+                self._place_card(i, c, card)
+                if not self._row_measured:
+                    # Measure a real card once, so later visibility maths matches the layout
+                    self._row_height = card["box"].sizeHint().height() + self.grid.verticalSpacing()
+                    self._row_measured = True
+                    self._reserve_rows()
+            self._load_card_image(c["id"], card, c.get("img_url"))
+
+    def _place_card(self, i, c, card):
+        self._update_card(card, c, c["id"] == self._current_car_id)
+        pos = (i // CAR_GRID_COLUMNS, i % CAR_GRID_COLUMNS)
+        if card.get("pos") != pos:
+            self.grid.removeWidget(card["box"])
+            self.grid.addWidget(card["box"], *pos)
+            card["pos"] = pos
+
+    def _create_card(self, car_id):
+        box = QFrame()
+        box.setProperty("class", "car_card")
+
+        bl = QVBoxLayout()
+        img_lbl = QLabel("Loading Image...")
+        img_lbl.setFixedSize(CAR_IMAGE_WIDTH, CAR_IMAGE_HEIGHT)
+        img_lbl.setAlignment(Qt.AlignCenter)
+        img_lbl.setObjectName(f"img_lbl_{car_id}")
+
+        name = QLabel()
+        name.setFont(FONT_CAR_NAME)
+        cost = QLabel()
+        cost.setFont(FONT_CAR_DETAIL)
+        status_lbl = QLabel()
+        status_lbl.setFont(FONT_CAR_DETAIL)
+        status_lbl.setTextFormat(Qt.RichText)
+
+        btn = QPushButton("Select Car")
+        btn.setFont(FONT_CARD_LABEL)
+        # Looks the row up at click time, so it always selects the card's latest data
+        btn.clicked.connect(lambda _, cid=car_id: self.select_car(self.car_boxes[cid]["row"]))
+
+        for w in (img_lbl, name, cost, status_lbl, btn):
+            bl.addWidget(w, alignment=Qt.AlignCenter)
+        box.setLayout(bl)
+
+        return {"box": box, "label": img_lbl, "name": name, "cost": cost, "status": status_lbl, "btn": btn}
+
+    def _update_card(self, card, c, car_is_current_selection):
+        status = c["status"]
+        is_available_in_db = c["available"]
+        should_be_disabled = not car_is_current_selection and not is_available_in_db
+
+        # Only re-applied when it changes, since each setStyleSheet re-parses and re-polishes the card
+        qss = CAR_CARD_QSS_UNAVAIL if should_be_disabled else CAR_CARD_QSS_AVAIL
+        if car_is_current_selection:
+            qss = CAR_CARD_QSS_CURRENT
+        if card.get("qss") != qss:
+            card["box"].setProperty("status", "unavailable" if should_be_disabled else "available")
+            card["box"].setStyleSheet(qss)
+            card["qss"] = qss
+
+        name_text = c["name"]
+        if car_is_current_selection:
+            name_text = f"{name_text} (Current Selection)"
+        card["name"].setText(name_text)
+        card["cost"].setText(f"₱{c['hourly_rate']}/hr")
+        status_text = f"Status: {status}"
+        status_color = "red" if not is_available_in_db else "#008000"
+        cond_text = f"Condition: {c.get('car_condition', '')}"
+        card["status"].setText(
+            f"{cond_text} | <span style='color:{status_color}; font-weight:bold;'>{status_text}</span>")
+
+        card["btn"].setEnabled(not should_be_disabled)
+        card["btn"].setText(f"Status: {status}" if should_be_disabled else "Select Car")
+
+        card["row"] = c  # select_car reads the current row from here
+
+    def _load_card_image(self, car_id, card, url):
+        if "img_url" in card and card["img_url"] == url:
+            return  # already shown, or requested, for this URL (which may be None: no image set)
+        card["img_url"] = url
+        img_lbl = card["label"]
+
+        # A grid rebuild reuses the already decoded and scaled pixmap
+        pix = QPixmapCache.find(_car_pixmap_key(car_id, url))
+        if pix is not None and not pix.isNull():
+            img_lbl.setPixmap(pix)
+            return
 
-            car_data_temp = {
-                "id": c["id"],
-                "name": c["name"],
-                "hourly": float(c["hourly_rate"]),
-                "condition": c["car_condition"]
-            }
-            self.car_boxes[car_id] = {"car": car_data_temp, "label": img_lbl}
+        # Images already on disk are shown straight away without a download
+        cached = load_cached_image_data(url)
+        if cached:
+            self.update_car_image(car_id, cached)
+            return
 
-            thread = ImageLoaderThread(car_id, c.get("img_url"))
-            thread.image_loaded.connect(self.update_car_image)
-            self.threads.append(thread)
-            thread.start()
+        img_lbl.setText("Loading Image...")
+        request_car_image(car_id, url, self.update_car_image)
 
     def update_car_image(self, car_id, image_data):
-        if car_id in self.car_boxes:
-            img_lbl = self.car_boxes[car_id]["label"]
+        card = self.car_boxes.get(car_id)
+        if card is not None:
+            img_lbl = card["label"]
             pix = QPixmap()
             if pix.loadFromData(image_data):
-                pixmap = pix.scaled(img_lbl.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                img_lbl.setPixmap(pixmap)
+                # Server-sized thumbnails usually fit already; only larger images pay for a smooth scale
+                if pix.width() > CAR_IMAGE_WIDTH or pix.height() > CAR_IMAGE_HEIGHT:
+                    pix = pix.scaled(img_lbl.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                QPixmapCache.insert(_car_pixmap_key(car_id, card["img_url"]), pix)
+                img_lbl.setPixmap(pix)
             else:
                 img_lbl.setText("Image Failed to Load")
 
@@ -1047,10 +2087,9 @@ class CarSelectionPage(QWidget):
             user_id = self.stacked.user_data.get("user_id")
             new_car_id = car["id"]
 
-            # Fetch the old car ID from the rentals table
-            sql_old_car = "SELECT car_id FROM rentals WHERE id = %s"
-            old_car_result = db_fetch_one(sql_old_car, (rental_id,))
-            old_car_id = old_car_result.get('car_id') if old_car_result else None
+            # Set by MyRentalsPage.edit_car from the rentals row it already loaded; lets the common
+            # "same car" case be answered without a round-trip
+            old_car_id = edit.get("old_car_id")
 
             if old_car_id == new_car_id:
                 QMessageBox.warning(self, "No Change", "This is the same car you already have assigned.")
@@ -1058,18 +2097,33 @@ class CarSelectionPage(QWidget):
                 self.stacked.setCurrentIndex(self.stacked.my_rentals_index)
                 return
 
-            # Insert a pending request into a new table (car_change_requests)
+            # Insert a pending request (car_change_requests). old_car_id is read from the rental in the
+            # same statement, so it can't go stale; no row is inserted if the rental already has the new
+            # car. Repeating a request that is still pending only refreshes its updated_at (uniq_pending),
+            # and id = LAST_INSERT_ID(id) reports that request's id, so the outcome is told apart without
+            # a second query: 1 row inserted -> new request; no row but an id -> already pending; neither
+            # -> nothing was selected, i.e. the rental already has this car.
             sql_request = """
                           INSERT INTO car_change_requests (user_id, rental_id, old_car_id, new_car_id, status, created_at)
-                          VALUES (%s, %s, %s, %s, 'Pending', NOW())
+                          SELECT %s, r.id, r.car_id, %s, 'Pending', NOW()
+                          FROM rentals r
+                          WHERE r.id = %s AND r.car_id <> %s
+                          ON DUPLICATE KEY UPDATE updated_at = NOW(), id = LAST_INSERT_ID(id)
                           """
-            success = db_execute(sql_request, (user_id, rental_id, old_car_id, new_car_id))
+            result = db_execute_prepared(sql_request, (user_id, new_car_id, rental_id, new_car_id),
+                                         fetch_rowcount=True, fetch_id=True)
 
-            if success:
+            if result is False:
+                QMessageBox.critical(self, "Error", "Failed to submit car change request.")
+            elif result[0] != 1 and result[1]:
+                QMessageBox.information(self, "Request Pending",
+                                        "A change to this car is already waiting for admin approval.")
+            elif result[0] != 1:
+                QMessageBox.warning(self, "No Change", "This is the same car you already have assigned.")
+            else:
+                db_cache_invalidate("car_change_requests")
                 QMessageBox.information(self, "Request Submitted",
                                         "Your car change has been submitted for admin approval. Check 'My Rentals' later for updates.")
-            else:
-                QMessageBox.critical(self, "Error", "Failed to submit car change request.")
 
             self.stacked.user_data.pop("editing", None)
             self.stacked.user_data.pop("car_temp", None)
@@ -1094,28 +2148,12 @@ class TimeInfoPage(QWidget):
         v.addWidget(title)
         form = QFormLayout()
 
-        now = datetime.now()
-        start_h_widgets = QHBoxLayout()
-        self.start_year = self._create_labeled_combobox("Year", start_h_widgets)
-        self.start_month = self._create_labeled_combobox("Month", start_h_widgets)
-        self.start_day = self._create_labeled_combobox("Day", start_h_widgets)
-        self.start_hour = self._create_labeled_combobox("Hour", start_h_widgets)
-        self.setup_datetime_comboboxes(self.start_hour, self.start_day, self.start_month, self.start_year, now)
-
-        initial_end = now + timedelta(hours=1)
-        end_h_widgets = QHBoxLayout()
-        self.end_year = self._create_labeled_combobox("Year", end_h_widgets)
-        self.end_month = self._create_labeled_combobox("Month", end_h_widgets)
-        self.end_day = self._create_labeled_combobox("Day", end_h_widgets)
-        self.end_hour = self._create_labeled_combobox("Hour", end_h_widgets)
-        self.setup_datetime_comboboxes(self.end_hour, self.end_day, self.end_month, self.end_year, initial_end)
-
-        for w in [self.start_hour, self.start_day, self.start_month, self.start_year,
-                  self.end_hour, self.end_day, self.end_month, self.end_year]:
-            w.setFont(FONT_LABEL)
-
-        form.addRow("Start Date/Time:", start_h_widgets)
-        form.addRow("End Date/Time:", end_h_widgets)
+        now = datetime.now().replace(minute=0, second=0, microsecond=0)
+        self.start_dt = self._create_datetime_edit(now)
+        self.end_dt = self._create_datetime_edit(now + timedelta(hours=1))
+
+        form.addRow("Start Date/Time:", self.start_dt)
+        form.addRow("End Date/Time:", self.end_dt)
 
         h = QHBoxLayout()
         self.rb_pick = QRadioButton("Pickup (Free)")
@@ -1149,29 +2187,19 @@ class TimeInfoPage(QWidget):
         v.addLayout(btn_h)
         self.setLayout(v)
 
-    def _create_labeled_combobox(self, label_text, layout):
-        container = QVBoxLayout()
-        container.setContentsMargins(0, 0, 0, 0)
-        container.setSpacing(2)
-        label = QLabel(label_text)
-        label.setObjectName("time_label")
-        label.setStyleSheet(".time_label { font-size: 10pt; font-weight: 400; color: #555555; }")
-        combo = QComboBox()
-        container.addWidget(label)
-        container.addWidget(combo)
-        layout.addLayout(container)
-        return combo
-
-    def setup_datetime_comboboxes(self, hour_cb, day_cb, month_cb, year_cb, initial_dt: datetime):
-        hour_cb.addItems([f"{i:02d}" for i in range(24)])
-        hour_cb.setCurrentText(f"{initial_dt.hour:02d}")
-        day_cb.addItems([f"{i:02d}" for i in range(1, 32)])
-        day_cb.setCurrentText(f"{initial_dt.day:02d}")
-        month_cb.addItems([f"{i:02d}" for i in range(1, 13)])
-        month_cb.setCurrentText(f"{initial_dt.month:02d}")
-        current_year = initial_dt.year
-        year_cb.addItems([str(i) for i in range(current_year, current_year + 3)])
-        year_cb.setCurrentText(str(initial_dt.year))
+    def _create_datetime_edit(self, initial_dt: datetime):
+        # Whole hours only, so there is nothing to parse and no invalid date (e.g. February 30th) can be
+        # entered; showEvent limits the range to the current hour up to three years ahead
+        edit = QDateTimeEdit(QDateTime(initial_dt))
+        edit.setDisplayFormat("yyyy-MM-dd HH:00")
+        edit.setCalendarPopup(True)
+        edit.setTimeSpec(Qt.LocalTime)
+        edit.setFont(FONT_LABEL)
+        return edit
+
+    @staticmethod
+    def _picked(edit):
+        return edit.dateTime().toPyDateTime().replace(minute=0, second=0, microsecond=0)
 
     def showEvent(self, event):
         tt = self.stacked.user_data.get("time_temp")
@@ -1191,22 +2219,19 @@ class TimeInfoPage(QWidget):
                 pass
             back_btn.clicked.connect(lambda: self.stacked.setCurrentIndex(self.stacked.car_index))
 
+        # Keep the lower bound at the current hour even if the app has been open for a while
+        now = QDateTime(datetime.now().replace(minute=0, second=0, microsecond=0))
+        for edit in (self.start_dt, self.end_dt):
+            edit.setDateTimeRange(now, now.addYears(3))
+
         if tt:
             try:
                 start_dt_iso = tt.get("start")
                 end_dt_iso = tt.get("end")
                 if start_dt_iso:
-                    start_dt = datetime.fromisoformat(start_dt_iso)
-                    self.start_year.setCurrentText(f"{start_dt.year}")
-                    self.start_month.setCurrentText(f"{start_dt.month:02d}")
-                    self.start_day.setCurrentText(f"{start_dt.day:02d}")
-                    self.start_hour.setCurrentText(f"{start_dt.hour:02d}")
+                    self.start_dt.setDateTime(QDateTime(datetime.fromisoformat(start_dt_iso)))
                 if end_dt_iso:
-                    end_dt = datetime.fromisoformat(end_dt_iso)
-                    self.end_year.setCurrentText(f"{end_dt.year}")
-                    self.end_month.setCurrentText(f"{end_dt.month:02d}")
-                    self.end_day.setCurrentText(f"{end_dt.day:02d}")
-                    self.end_hour.setCurrentText(f"{end_dt.hour:02d}")
+                    self.end_dt.setDateTime(QDateTime(datetime.fromisoformat(end_dt_iso)))
                 mode = tt.get("mode", "Pickup")
                 if mode == "Delivery":
                     self.rb_del.setChecked(True);
@@ -1214,25 +2239,15 @@ class TimeInfoPage(QWidget):
                 else:
                     self.rb_pick.setChecked(True);
                     self.del_loc.clear()
+                if self.stacked.user_data.get("editing", {}).get("type") == "delivery":
+                    self.rb_del.setChecked(True)
+                    self.del_loc.setFocus()
             except Exception as e:
                 pass
 
     def on_next(self):
-        try:
-            start_year = int(self.start_year.currentText())
-            start_month = int(self.start_month.currentText())
-            start_day = int(self.start_day.currentText())
-            start_hour = int(self.start_hour.currentText())
-            start = datetime(start_year, start_month, start_day, start_hour, 0, 0)
-            end_year = int(self.end_year.currentText())
-            end_month = int(self.end_month.currentText())
-            end_day = int(self.end_day.currentText())
-            end_hour = int(self.end_hour.currentText())
-            end = datetime(end_year, end_month, end_day, end_hour, 0, 0)
-        except ValueError:
-            QMessageBox.warning(self, "Invalid Date",
-                                "The selected date combination is invalid (e.g., February 30th). Please check the month and day.")
-            return
+        start = self._picked(self.start_dt)
+        end = self._picked(self.end_dt)
 
         now = datetime.now().replace(minute=0, second=0, microsecond=0)
         if end <= start: QMessageBox.warning(self, "Dates Error",
@@ -1246,23 +2261,33 @@ class TimeInfoPage(QWidget):
         car = self.stacked.user_data.get("car_temp")
         edit = self.stacked.user_data.get("editing")
 
+        hours = hours_between(start, end)
+        delivery_fee = 20 if mode == "Delivery" else 0
+        self.stacked.user_data["time_temp"] = {"start": start.isoformat(), "end": end.isoformat(), "hours": hours,
+                                               "mode": mode, "delivery_location": del_loc}
+
         if edit and not car:
-            rental_id = edit.get("rental_id")
-            sql = "SELECT c.id, c.name, c.hourly_rate, c.car_condition FROM rentals r JOIN cars c ON r.car_id = c.id WHERE r.id = %s"
-            car_db = db_fetch_one(sql, (rental_id,))
-            if car_db:
-                car = {"id": car_db["id"], "name": car_db["name"], "hourly": float(car_db["hourly_rate"]),
-                       "condition": car_db["car_condition"]}
-                self.stacked.user_data["car_temp"] = car
+            # Rental keeps its car: reprice it from cars.hourly_rate inside the UPDATE itself, which saves
+            # fetching the car first and can't use a rate that changed in between
+            sql = """
+                  UPDATE rentals r
+                      JOIN cars c ON r.car_id = c.id
+                  SET r.start_time        = %s,
+                      r.end_time          = %s,
+                      r.hours_rented      = %s,
+                      r.rental_mode       = %s,
+                      r.delivery_location = %s,
+                      r.total_cost        = c.hourly_rate * %s + %s
+                  WHERE r.id = %s
+                  """
+            params = (start, end, hours, mode, del_loc, hours, delivery_fee, edit.get("rental_id"))
+            self._finish_edit(db_execute(sql, params))
+            return
 
         if not car: QMessageBox.warning(self, "Car", "No car selected."); return
 
-        hours = hours_between(start, end)
         car_cost = car.get("hourly", 0) * hours
-        delivery_fee = 20 if mode == "Delivery" else 0
         total = car_cost + delivery_fee
-        self.stacked.user_data["time_temp"] = {"start": start.isoformat(), "end": end.isoformat(), "hours": hours,
-                                               "mode": mode, "delivery_location": del_loc}
         self.stacked.user_data["costs_temp"] = {"hours": hours, "car": car_cost, "delivery": delivery_fee,
                                                 "total": total}
 
@@ -1280,19 +2305,20 @@ class TimeInfoPage(QWidget):
                   WHERE id = %s \
                   """
             params = (car["id"], start, end, hours, mode, del_loc, total, rental_id)
-            success = db_execute(sql, params)
-
-            if success:
-                QMessageBox.information(self, "Updated", "Booking updated.")
-                self.stacked.user_data.pop("editing", None)
-                self.stacked.setCurrentIndex(self.stacked.my_rentals_index)
-                return
-            else:
-                QMessageBox.critical(self, "Error", "Failed to update booking in database.")
-                return
+            self._finish_edit(db_execute(sql, params))
+            return
 
         self.stacked.setCurrentIndex(self.stacked.summary_index)
 
+    def _finish_edit(self, success):
+        if success:
+            db_cache_invalidate("rentals")
+            QMessageBox.information(self, "Updated", "Booking updated.")
+            self.stacked.user_data.pop("editing", None)
+            self.stacked.setCurrentIndex(self.stacked.my_rentals_index)
+        else:
+            QMessageBox.critical(self, "Error", "Failed to update booking in database.")
+
 
 class SummaryPage(QWidget):
     # ... (SummaryPage remains the same)
@@ -1370,16 +2396,22 @@ class SummaryPage(QWidget):
             user_id, car["id"], datetime.fromisoformat(t["start"]), datetime.fromisoformat(t["end"]),
             t["hours"], t["mode"], t["delivery_location"], costs["total"]
         )
-        rental_id = db_execute(rental_sql, params, fetch_id=True)
+        # 2. Insert into Payments Table, in the same transaction: the booking and its payment are
+        # committed together (or not at all), and the new rental id comes from the cursor directly
+        payment_sql = "INSERT INTO payments (rental_id, amount, payment_time) VALUES (%s, %s, NOW())"
+        rental_id = None
+        try:
+            with hot_ctx(commit=True) as (conn, prepare):
+                cursor = prepare(rental_sql)
+                cursor.execute(rental_sql, params)
+                rental_id = cursor.lastrowid
+                prepare(payment_sql).execute(payment_sql, (rental_id, costs["total"]))
+        except (DBUnavailableError, _mysql().Error) as err:
+            rental_id = None
+            QMessageBox.critical(self, "SQL Execution Error", f"Failed to execute transaction: {err}")
 
         if rental_id:
-            # 2. Insert into Payments Table
-            payment_sql = "INSERT INTO payments (rental_id, amount, payment_time) VALUES (%s, %s, NOW())"
-            payment_success = db_execute(payment_sql, (rental_id, costs["total"]))
-
-            if not payment_success:
-                QMessageBox.warning(self, "Warning", "Booking saved, but failed to record payment.")
-
+            db_cache_invalidate("rentals")
             QMessageBox.information(self, "Saved",
                                     f"Booking saved (ID: {rental_id}). Total paid: ₱{costs.get('total', 0)}")
             for k in ("car_temp", "time_temp", "costs_temp"): ud.pop(k, None)
@@ -1424,6 +2456,8 @@ if __name__ == "__main__":
     # FIX: Ensure QApplication is initialized before any QMessageBox calls.
     app = QApplication(sys.argv)
     app.setStyleSheet(STYLE)
+    QThreadPool.globalInstance().setMaxThreadCount(WORKER_THREADS)
+    QPixmapCache.setCacheLimit(PIXMAP_CACHE_KB)
 
     conn_check = get_db_connection(show_error=True)
 
@@ -1431,6 +2465,8 @@ if __name__ == "__main__":
         sys.exit(app.exec_())
 
     conn_check.close()
+    ensure_schema()
+    seed_sample_data()
 
     win = CarRentalApp()
     win.setWindowTitle("Car Rental System — MySQL/XAMPP")
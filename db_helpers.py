@@ -1,7 +1,20 @@
+import atexit
+import logging
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from itertools import groupby
+
 import mysql.connector
+import mysql.connector.pooling
 from mysql.connector import Error as MySQL_Error
 from PyQt5.QtWidgets import QMessageBox
 
+log = logging.getLogger("db")
+
 # !!! ADJUST THESE SETTINGS IF YOUR XAMPP/MySQL CONFIG IS DIFFERENT !!!
 DB_CONFIG = {
     "host": "127.0.0.1",
@@ -10,67 +23,538 @@ DB_CONFIG = {
     "database": "car_rental_db" # The database name you created
 }
 
+POOL_SIZE = 8
+POOL_IDLE_TIMEOUT = 120  # seconds a pooled connection may sit unused before it is closed
+POOL_MIN_IDLE = 1  # connections kept open however long the app stays idle
+POOL_RETRY_SECS = 10  # after a failed pool build, calls fail straight away for this long instead of re-dialling
+_POOL = None
+_POOL_LOCK = threading.Lock()
+_pool_failure = None  # (when, error) of the last failed pool build
+
+class ReapingPool(mysql.connector.pooling.MySQLConnectionPool):
+    """
+    MySQLConnectionPool that closes connections left idle for more than `idle_timeout` seconds (always
+    keeping `min_idle`), so a desktop app sitting idle for hours doesn't hold POOL_SIZE server sessions.
+    Reaped slots are reopened one at a time when a checkout finds no idle connection left. Once
+    start_reaper() is called, the reaper checks every idle_timeout / 2 seconds (at least every second).
+    """
+
+    def __init__(self, idle_timeout=POOL_IDLE_TIMEOUT, min_idle=POOL_MIN_IDLE, **kwargs):
+        self.idle_timeout = idle_timeout
+        self.min_idle = min_idle
+        self._idle_since = {}  # id(connection) -> when it was last handed back
+        self._reaped = 0
+        self._reap_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def start_reaper(self):
+        threading.Thread(target=self._reap_loop, name="db-pool-reaper", daemon=True).start()
+
+    def add_connection(self, cnx=None):
+        # Called with the connection when a PooledMySQLConnection is closed, i.e. handed back
+        if cnx is not None:
+            self._idle_since[id(cnx)] = time.monotonic()
+        super().add_connection(cnx)
+
+    def fill(self, conns):
+        """
+        Adds connections opened outside the pool (see _connect_in_parallel). Slots they leave empty are
+        counted like reaped ones, so checkouts reopen them instead of the pool staying short.
+        """
+        for cnx in conns:
+            # add_connection only stamps connections it opens itself; without it the first checkout sees
+            # a config-version mismatch and reconfigures and reconnects the connection all over again
+            cnx.pool_config_version = self._config_version
+            self.add_connection(cnx)
+        with self._reap_lock:
+            self._reaped += self.pool_size - len(conns)
+
+    def get_connection(self):
+        with self._reap_lock:
+            if self._reaped and self._cnx_queue.empty():
+                super().add_connection()  # reopen one reaped slot
+                self._reaped -= 1
+            return super().get_connection()
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(max(1, self.idle_timeout / 2))
+            self._reap()
+
+    def _reap(self):
+        now = time.monotonic()
+        with self._reap_lock:
+            # _cnx_queue holds the idle connections, longest idle first; the pool has no eviction API
+            idle = []
+            while True:
+                try:
+                    idle.append(self._cnx_queue.get_nowait())
+                except queue.Empty:
+                    break
+            remaining = len(idle)
+            for cnx in idle:
+                if remaining > self.min_idle and now - self._idle_since.get(id(cnx), now) > self.idle_timeout:
+                    self._idle_since.pop(id(cnx), None)
+                    remaining -= 1
+                    self._reaped += 1
+                    try:
+                        cnx.disconnect()
+                    except MySQL_Error:
+                        pass
+                else:
+                    self._cnx_queue.put(cnx)
+
+def _get_pool():
+    """
+    Creates the shared connection pool on first use, so a MySQL outage still surfaces at startup.
+    Its POOL_SIZE connections are opened in parallel rather than one handshake after another (which is
+    what MySQLConnectionPool does when handed the connection settings itself). If that fails, the error
+    is raised again without dialling for POOL_RETRY_SECS, which also releases callers that were waiting
+    on the failed attempt.
+    """
+    global _POOL, _pool_failure
+    with _POOL_LOCK:
+        if _POOL is None:
+            if _pool_failure is not None and time.monotonic() - _pool_failure[0] < POOL_RETRY_SECS:
+                raise _pool_failure[1]
+            # pool_reset_session=False skips the COM_RESET_CONNECTION round-trip on every hand-back. That is
+            # only safe because nothing here leaves session state behind: code that runs SET @var / SET SESSION
+            # or START TRANSACTION on a pooled connection must undo it (commit/rollback, as Session does)
+            # before close(). autocommit=True keeps a read-only checkout from going back to the pool with its
+            # snapshot still open
+            pool = ReapingPool(pool_name="carrental", pool_size=POOL_SIZE, pool_reset_session=False)
+            pool.set_config(autocommit=True, **DB_CONFIG)
+            try:
+                pool.fill(_connect_in_parallel(POOL_SIZE))
+            except MySQL_Error as err:
+                _pool_failure = (time.monotonic(), err)
+                raise
+            _pool_failure = None
+            _POOL = pool
+            pool.start_reaper()  # only for the pool actually kept, so failed attempts leave no thread behind
+        return _POOL
+
+def _connect_in_parallel(count):
+    """Opens `count` connections concurrently; raises the first error only if none could be opened."""
+    conns, errors = [], []
+
+    def connect():
+        try:
+            conns.append(mysql.connector.connect(autocommit=True, **DB_CONFIG))
+        except MySQL_Error as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=connect, daemon=True) for _ in range(count)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    if not conns:
+        raise errors[0]
+    return conns
+
+def warm_up():
+    """Opens the pool's connections now, e.g. while the UI starts; returns the error message on failure."""
+    try:
+        _get_pool()
+    except MySQL_Error as err:
+        return str(err)
+    return None
+
 def get_db_connection(show_error=True):
-    """Establishes a MySQL database connection."""
-    conn = None
+    """
+    Returns a pooled MySQL database connection; close() hands it back to the pool.
+    Falls back to a direct connection when every pooled one is checked out.
+    """
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        return conn
+        try:
+            return _get_pool().get_connection()
+        except mysql.connector.PoolError:
+            return mysql.connector.connect(autocommit=True, **DB_CONFIG)
     except MySQL_Error as err:
         if show_error:
             # Setting the parent to None works for startup checks
             QMessageBox.critical(None, "Database Error", f"Database connection failed!\n\nError: {err}")
         return None
 
-def db_fetch_all(sql, params=None):
-    """Fetches all rows for a given SQL query."""
-    conn = get_db_connection(show_error=False)
-    if conn is None: return []
+# Result cache for repeated SELECTs: (sql, params tuple) -> (stored_at, result), least recently used first.
+# It is opt-in: only calls passing ttl > 0 use it. db_execute drops the entries reading the table it writes
+# to; invalidate() does the same on demand, but writes from other clients go unseen until the ttl runs out.
+QCACHE_TTL = 5  # seconds, for call sites that opt in and can live with results that old
+QCACHE_MAX = 256
+_QCACHE = OrderedDict()
+_QCACHE_LOCK = threading.Lock()  # the write-behind thread invalidates entries too
+_qcache_generation = 0  # bumped by invalidate(), so a fetch that raced a write doesn't store its stale rows
+_WRITE_TARGET = re.compile(r"^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)", re.I)
+
+def _copy_result(result):
+    """
+    Shallow copy of a fetch result (the list and each row dict), so no caller sees another's edits to
+    its rows. The cache keeps its own copy and hands out fresh ones; tuple rows are immutable already.
+    """
+    if isinstance(result, dict):
+        return dict(result)
+    if isinstance(result, list):
+        return [dict(row) if isinstance(row, dict) else row for row in result]
+    return result
+
+def _cache_key(kind, sql, params, dictionary):
+    # Mapping params (named %(x)s placeholders) need their values in the key, not just their names
+    params = tuple(sorted(params.items())) if isinstance(params, Mapping) else tuple(params or ())
+    return (kind, sql, params, dictionary)
+
+def _cache_get(key, ttl):
+    if ttl <= 0:
+        return None
+    with _QCACHE_LOCK:
+        hit = _QCACHE.get(key)
+        if hit is None or time.monotonic() - hit[0] >= ttl:
+            return None
+        _QCACHE.move_to_end(key)
+        return _copy_result(hit[1])
+
+def _cache_put(key, result, ttl, generation):
+    if ttl <= 0 or not result:  # [] / None may just mean the query failed, so don't pin it
+        return
+    with _QCACHE_LOCK:
+        if generation != _qcache_generation:  # invalidated while we were fetching
+            return
+        _QCACHE[key] = (time.monotonic(), _copy_result(result))
+        _QCACHE.move_to_end(key)
+        while len(_QCACHE) > QCACHE_MAX:
+            _QCACHE.popitem(last=False)
+
+def invalidate(*tables):
+    """Drops cached results whose SQL reads any of the given tables (everything when none are given)."""
+    global _qcache_generation
+    pattern = re.compile(r"\b(" + "|".join(map(re.escape, tables)) + r")\b", re.I) if tables else None
+    with _QCACHE_LOCK:
+        _qcache_generation += 1
+        if pattern is None:
+            _QCACHE.clear()
+            return
+        for key in [k for k in _QCACHE if pattern.search(k[1])]:
+            del _QCACHE[key]
+
+def db_fetch_all(sql, params=None, ttl=0, prepared=False, dictionary=True):
+    """
+    Fetches all rows for a given SQL query. With ttl > 0 (e.g. QCACHE_TTL), repeats within `ttl`
+    seconds are served from the cache; the default ttl=0 always asks the server.
+    prepared=True runs it as a server-side prepared statement (see _run_prepared); dictionary=False
+    returns plain tuples in SELECT order, skipping a dict per row for large listings.
+    """
+    key = _cache_key("all", sql, params, dictionary)
+    cached = _cache_get(key, ttl)
+    if cached is not None: return cached
+    generation = _qcache_generation
+    result = _fetch_all(sql, params, prepared, dictionary)
+    _cache_put(key, result, ttl, generation)
+    return result
+
+def db_fetch_one(sql, params=None, ttl=0, prepared=False, dictionary=True):
+    """
+    Fetches a single row for a given SQL query. With ttl > 0 (e.g. QCACHE_TTL), repeats within `ttl`
+    seconds are served from the cache; the default ttl=0 always asks the server.
+    prepared=True runs it as a server-side prepared statement (see _run_prepared); dictionary=False
+    returns plain tuples in SELECT order, skipping a dict per row for large listings.
+    """
+    key = _cache_key("one", sql, params, dictionary)
+    cached = _cache_get(key, ttl)
+    if cached is not None: return cached
+    generation = _qcache_generation
+    result = _fetch_one(sql, params, prepared, dictionary)
+    _cache_put(key, result, ttl, generation)
+    return result
+
+EXECUTEMANY_CHUNK_ROWS = 500  # rows per executemany batch, keeping each packet well under max_allowed_packet
+
+def _as_dicts(cursor, rows):
+    """Turns the tuple rows of `cursor`'s last query into dicts keyed by column name."""
+    names = cursor.column_names
+    return [dict(zip(names, row)) for row in rows]
+
+def _close_quietly(conn):
+    """
+    Closes (or, for a pooled connection, hands back) `conn` without first asking is_connected(), which
+    would cost a ping round-trip per query; closing an already dead connection is simply ignored.
+    """
     try:
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(sql, params or ())
-        result = cursor.fetchall()
-        cursor.close()
-        return result
+        conn.close()
+    except MySQL_Error:
+        pass
+
+class Session:
+    """
+    One pooled connection and one cursor for a run of queries, e.g. everything a page loads:
+        with db_helpers.session() as s:
+            rentals = s.fetch_all(...)
+    With commit=True the block is one transaction, committed on a clean exit and rolled back on an
+    exception. Errors propagate as mysql.connector errors. Queries run here bypass the result cache,
+    but writes still invalidate it once the session ends.
+    """
+
+    def __init__(self, commit=False):
+        self.commit = commit
+        self.conn = None
+        self.cursor = None
+        self._written = set()
+
+    def __enter__(self):
+        self.conn = get_db_connection(show_error=False)
+        if self.conn is None:
+            raise MySQL_Error(msg="Database connection failed")
+        try:
+            if self.commit:
+                self.conn.start_transaction()
+            # buffered: a fetch_one leaves no unread rows behind for the next statement
+            self.cursor = self.conn.cursor(buffered=True)
+        except MySQL_Error:
+            _close_quietly(self.conn)
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.cursor.close()
+            if self.commit:
+                if exc_type is None:
+                    self.conn.commit()
+                else:
+                    self.conn.rollback()
+        finally:
+            _close_quietly(self.conn)
+            if self._written and (exc_type is None or not self.commit):
+                # Committed writes (or autocommitted ones, outside a transaction) drop the results they made stale
+                invalidate(*(() if None in self._written else self._written))
+        return False
+
+    def fetch_all(self, sql, params=None, dictionary=True):
+        self.cursor.execute(sql, params or ())
+        rows = self.cursor.fetchall()
+        return _as_dicts(self.cursor, rows) if dictionary else rows
+
+    def fetch_one(self, sql, params=None, dictionary=True):
+        self.cursor.execute(sql, params or ())
+        row = self.cursor.fetchone()
+        return _as_dicts(self.cursor, [row])[0] if dictionary and row is not None else row
+
+    def execute(self, sql, params=None, fetch_id=False):
+        """Runs an INSERT, UPDATE, or DELETE; returns the new row id with fetch_id=True, else the row count."""
+        self.cursor.execute(sql, params or ())
+        target = _WRITE_TARGET.match(sql)
+        self._written.add(target.group(1) if target else None)  # None: unknown table, clear everything
+        return self.cursor.lastrowid if fetch_id else self.cursor.rowcount
+
+    def execute_many(self, sql, seq_of_params):
+        """
+        Runs one statement for every params tuple, EXECUTEMANY_CHUNK_ROWS at a time. The driver folds each
+        chunk of an INSERT ... VALUES into one multi-row INSERT, so N rows cost N/500 round-trips, not N.
+        """
+        rows = list(seq_of_params)
+        for i in range(0, len(rows), EXECUTEMANY_CHUNK_ROWS):
+            self.cursor.executemany(sql, rows[i:i + EXECUTEMANY_CHUNK_ROWS])
+        if rows:
+            target = _WRITE_TARGET.match(sql)
+            self._written.add(target.group(1) if target else None)
+
+def session(commit=False):
+    return Session(commit)
+
+# Hot point lookups and updates run as server-side prepared statements on one dedicated connection, whose
+# prepared cursors are kept (least recently used first) so each statement is parsed and planned only once
+PREPARED_CACHE_MAX = 64
+_HOT_LOCK = threading.Lock()
+_hot_conn = None
+_PREPARED_CURSORS = OrderedDict()
+
+def _drop_hot_connection():
+    """Forgets the hot connection and its prepared cursors (their statements die with the session)."""
+    global _hot_conn
+    _PREPARED_CURSORS.clear()
+    if _hot_conn is not None:
+        try:
+            _hot_conn.close()
+        except MySQL_Error:
+            pass
+    _hot_conn = None
+
+def _prepared_cursor(sql):
+    cursor = _PREPARED_CURSORS.get(sql)
+    if cursor is None:
+        if len(_PREPARED_CURSORS) >= PREPARED_CACHE_MAX:
+            try:
+                _PREPARED_CURSORS.popitem(last=False)[1].close()  # deallocates the server-side statement
+            except MySQL_Error:
+                pass
+        cursor = _PREPARED_CURSORS[sql] = _hot_conn.cursor(prepared=True)
+    _PREPARED_CURSORS.move_to_end(sql)
+    return cursor
+
+def _run_prepared(sql, params, fetch=None, dictionary=True):
+    """
+    Executes `sql` as a prepared statement on the hot connection. fetch="all"/"one" returns the rows
+    (as dicts unless dictionary=False; prepared cursors only produce tuples); otherwise lastrowid.
+    """
+    global _hot_conn
+    with _HOT_LOCK:
+        try:
+            if _hot_conn is None:
+                _hot_conn = mysql.connector.connect(autocommit=True, **DB_CONFIG)
+            cursor = _prepared_cursor(sql)
+            cursor.execute(sql, tuple(params or ()))
+            if fetch is None:
+                return cursor.lastrowid
+            rows = cursor.fetchall()  # fetched in full, so no unread rows hold up the next statement
+            if dictionary:
+                rows = _as_dicts(cursor, rows)
+            return rows if fetch == "all" else (rows[0] if rows else None)
+        except (mysql.connector.InterfaceError, mysql.connector.OperationalError):
+            _drop_hot_connection()  # lost the session: reconnect and re-prepare next time
+            raise
+
+def _fetch_all(sql, params, prepared=False, dictionary=True):
+    try:
+        if prepared:
+            return _run_prepared(sql, params, "all", dictionary)
+        with session() as s:
+            return s.fetch_all(sql, params, dictionary)
     except MySQL_Error as err:
-        print(f"DB Fetch All Error: {err}")
+        log.error("DB Fetch All Error: %s", err)
         return []
-    finally:
-        if conn and conn.is_connected():
-            conn.close()
 
-def db_fetch_one(sql, params=None):
-    """Fetches a single row for a given SQL query."""
-    conn = get_db_connection(show_error=False)
-    if conn is None: return None
+def _fetch_one(sql, params, prepared=False, dictionary=True):
     try:
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(sql, params or ())
-        result = cursor.fetchone()
-        cursor.close()
-        return result
+        if prepared:
+            return _run_prepared(sql, params, "one", dictionary)
+        with session() as s:
+            return s.fetch_one(sql, params, dictionary)
     except MySQL_Error as err:
-        print(f"DB Fetch One Error: {err}")
+        log.error("DB Fetch One Error: %s", err)
         return None
-    finally:
-        if conn and conn.is_connected():
-            conn.close()
 
-def db_execute(sql, params=None, fetch_id=False):
-    """Executes an INSERT, UPDATE, or DELETE query."""
+def db_iter(sql, params=None, dictionary=True):
+    """
+    Yields rows one at a time from an unbuffered cursor instead of materialising the whole result, for
+    large listings. Bypasses the result cache. Any rows the caller doesn't consume are drained before
+    the connection goes back to the pool. Yields nothing if no connection can be had; an error once the
+    query is running is logged and re-raised, so a half-read listing is never mistaken for a whole one.
+    """
     conn = get_db_connection(show_error=False)
-    if conn is None: return False
+    if conn is None: return
     try:
-        cursor = conn.cursor()
-        cursor.execute(sql, params or ())
-        conn.commit()
-        last_id = cursor.lastrowid
-        cursor.close()
+        cursor = conn.cursor(dictionary=dictionary, buffered=False)
+        try:
+            cursor.execute(sql, params or ())
+            exhausted = False
+            try:
+                for row in cursor:
+                    yield row
+                exhausted = True
+            finally:
+                if not exhausted:
+                    for _ in cursor:
+                        pass
+        finally:
+            cursor.close()
+    except MySQL_Error as err:
+        log.error("DB Iter Error: %s", err)
+        raise
+    finally:
+        _close_quietly(conn)
+
+def db_execute(sql, params=None, fetch_id=False, prepared=False):
+    """Executes an INSERT, UPDATE, or DELETE query (as a server-side prepared statement with prepared=True)."""
+    try:
+        if prepared:
+            last_id = _run_prepared(sql, params)
+            target = _WRITE_TARGET.match(sql)
+            invalidate(*([target.group(1)] if target else ()))
+        else:
+            with session(commit=True) as s:
+                last_id = s.execute(sql, params, fetch_id=True)
         return last_id if fetch_id else True
     except MySQL_Error as err:
-        print(f"DB Execute Error: {err}")
-        conn.rollback()
+        log.error("DB Execute Error: %s", err)
         return False
-    finally:
-        if conn and conn.is_connected():
-            conn.close()
\ No newline at end of file
+
+def db_execute_many(sql, seq_of_params):
+    """Executes one INSERT, UPDATE, or DELETE for many params tuples, all in one transaction."""
+    try:
+        with session(commit=True) as s:
+            s.execute_many(sql, seq_of_params)
+        return True
+    except MySQL_Error as err:
+        log.error("DB Execute Many Error: %s", err)
+        return False
+
+def db_fetch_in(sql_template, ids, key="id"):
+    """
+    Replaces an N+1 loop of per-row lookups: runs `sql_template`, whose "{ph}" marks the IN list
+    (e.g. "SELECT id, username FROM users WHERE id IN ({ph})"), once for all `ids` and returns
+    {row[key]: row}. No query is sent when `ids` is empty.
+    """
+    ids = list(dict.fromkeys(ids))  # duplicates would only lengthen the IN list
+    if not ids: return {}
+    head, marker, tail = sql_template.partition("{ph}")
+    if not marker:
+        raise ValueError("sql_template has no {ph} placeholder")
+    # Spliced in by hand rather than with str.format, so other braces in the SQL are left alone
+    sql = head + ", ".join(["%s"] * len(ids)) + tail
+    return {row[key]: row for row in db_fetch_all(sql, ids)}
+
+# Write-behind queue for writes nobody waits on (status flags, view logs, ...): a daemon thread collects up
+# to WRITE_BATCH_MAX of them, or whatever arrives within WRITE_FLUSH_SECS, and commits them together
+WRITE_BATCH_MAX = 100
+WRITE_FLUSH_SECS = 0.2
+_WRITE_QUEUE = queue.Queue()
+_writer = None
+_WRITER_LOCK = threading.Lock()
+
+def enqueue_write(sql, params=None):
+    """
+    Queues an INSERT, UPDATE, or DELETE to run in the background and returns straight away. Use it only
+    for writes whose result (row id, success) the caller doesn't need. If a batch fails, its writes are
+    retried one by one, and only those that fail again are logged and dropped.
+    """
+    global _writer
+    with _WRITER_LOCK:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_behind_loop, name="db-write-behind", daemon=True)
+            _writer.start()
+    _WRITE_QUEUE.put((sql, tuple(params or ())))
+
+def flush_writes():
+    """Blocks until every queued write has been executed (registered to run at exit)."""
+    if _writer is not None:
+        _WRITE_QUEUE.join()
+
+atexit.register(flush_writes)
+
+def _write_behind_loop():
+    while True:
+        batch = [_WRITE_QUEUE.get()]
+        deadline = time.monotonic() + WRITE_FLUSH_SECS
+        while len(batch) < WRITE_BATCH_MAX:
+            try:
+                batch.append(_WRITE_QUEUE.get(timeout=max(0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+        try:
+            # Runs of the same statement go through one executemany; grouping only consecutive runs
+            # keeps the writes in the order they were queued
+            with session(commit=True) as s:
+                for sql, items in groupby(batch, key=lambda item: item[0]):
+                    s.execute_many(sql, [params for _, params in items])
+        except Exception as err:  # keep the thread alive, or flush_writes would wait forever
+            # The batch rolled back as a whole; retry each write on its own so one bad row loses only itself
+            log.warning("DB Write-behind batch of %d failed, retrying one by one: %s", len(batch), err)
+            _write_one_by_one(batch)
+        finally:
+            for _ in batch:
+                _WRITE_QUEUE.task_done()
+
+def _write_one_by_one(batch):
+    for sql, params in batch:
+        try:
+            with session(commit=True) as s:
+                s.execute(sql, params)
+        except Exception as err:
+            log.error("DB Write-behind Error, write dropped: %s %r: %s", sql, params, err)
\ No newline at end of file
@@ -1,5 +1,9 @@
+import logging
+import logging.handlers
+import queue
 import sys
-from PyQt5.QtWidgets import QApplication, QStackedWidget
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtWidgets import QApplication, QMessageBox, QStackedWidget, QWidget
 
 # Import standalone module
 import db_helpers
@@ -22,6 +26,39 @@ from packages.admin.pages_admin import (
 )
 
 
+class DbProbeThread(QThread):
+    """
+    Opens the connection pool (which also checks the database can be reached) without holding up
+    the first frame; emits failed(message) if it can't.
+    """
+    failed = pyqtSignal(str)
+
+    def run(self):
+        error = db_helpers.warm_up()
+        if error:
+            self.failed.emit(f"Database connection failed!\n\nError: {error}")
+
+
+def on_db_unreachable(message):
+    QMessageBox.critical(None, "Database Error", message)
+    QApplication.instance().quit()
+
+
+def start_logging(path="car_rental.log"):
+    """
+    Routes log records (e.g. db_helpers' errors) through a queue to a file written by a background
+    listener, so logging never blocks the UI thread on disk or console I/O. Returns the listener.
+    """
+    records = queue.Queue()
+    listener = logging.handlers.QueueListener(records, logging.FileHandler(path, delay=True, encoding="utf-8"))
+    listener.handlers[0].setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(records))
+    listener.start()
+    return listener
+
+
 class CarRentalApp(QStackedWidget):
     def __init__(self):
         super().__init__()
@@ -39,34 +76,60 @@ class CarRentalApp(QStackedWidget):
         self.admin_index = 8
         self.requests_index = 9
 
-        # Add all pages to the stack in order
+        # Only the login page is built up front; every other page is built the first time it is
+        # shown or looked up, so startup doesn't pay for widget trees (and DB/image loads) never used
+        self._page_factories = {
+            self.car_index: CarSelectionPage,
+            self.summary_index: SummaryPage,
+            self.dashboard_index: DashboardPage,
+            self.register_index: RegisterPage,
+            self.complete_info_index: CompleteInfoPage,
+            self.my_rentals_index: MyRentalsPage,
+            self.time_index: TimeInfoPage,
+            self.admin_index: AdminPage,
+            self.requests_index: AdminRequestsPage,
+        }
+        # Add all pages to the stack in order (placeholders keep the indices valid until then)
         self.addWidget(LoginPage(self))
-        self.addWidget(CarSelectionPage(self))
-        self.addWidget(SummaryPage(self))
-        self.addWidget(DashboardPage(self))
-        self.addWidget(RegisterPage(self))
-        self.addWidget(CompleteInfoPage(self))
-        self.addWidget(MyRentalsPage(self))
-        self.addWidget(TimeInfoPage(self))
-        self.addWidget(AdminPage(self))
-        self.addWidget(AdminRequestsPage(self))
+        for _ in self._page_factories:
+            self.addWidget(QWidget())
 
         self.setCurrentIndex(self.login_index)
 
+    def _build_page(self, index):
+        factory = self._page_factories.pop(index, None)
+        if factory is not None:
+            placeholder = super().widget(index)
+            page = factory(self)
+            self.removeWidget(placeholder)
+            self.insertWidget(index, page)
+            placeholder.deleteLater()
+        return super().widget(index)
+
+    def widget(self, index):
+        return self._build_page(index)
+
+    def setCurrentIndex(self, index):
+        self._build_page(index)
+        super().setCurrentIndex(index)
+
 if __name__ == "__main__":
+    log_listener = start_logging()
     app = QApplication(sys.argv)
     app.setStyleSheet(STYLE)
 
-    # Use the imported module name
-    conn_check = db_helpers.get_db_connection(show_error=True)
-
-    if not conn_check:
-        sys.exit(app.exec_())
-
-    conn_check.close()
+    # The pool's handshakes and the connection check run alongside window construction, so a slow or
+    # dead MySQL host can't block the UI and the first query finds its connections already open
+    db_probe = DbProbeThread()
+    db_probe.failed.connect(on_db_unreachable)
+    db_probe.start()
+    app.aboutToQuit.connect(db_probe.wait)  # don't destroy the thread while it is still connecting
 
     win = CarRentalApp()
     win.setWindowTitle("Car Rental System — MySQL/XAMPP")
     win.showMaximized()
 
-    sys.exit(app.exec_())
\ No newline at end of file
+    exit_code = app.exec_()
+    db_helpers.flush_writes()  # so errors from the last queued writes still reach the log
+    log_listener.stop()  # flushes whatever is still queued
+    sys.exit(exit_code)
\ No newline at end of file